@@ -0,0 +1,59 @@
+"""
+Repeated queries against one CSV file: re-opening and re-parsing it for every query vs. a cached stream
+(in memory, in memory with a bounded prefix and on disk).
+Run with: uv run python benchmarks/bench_cache.py
+"""
+
+import csv
+import tempfile
+import time
+from pathlib import Path
+
+from pyrio import FileStream
+
+ROWS = 200_000
+REPEATS = 5
+
+QUERIES = (
+    lambda s: s.len(),
+    lambda s: s.map(lambda row: row["user"]).distinct().len(),
+    lambda s: s.map(lambda row: float(row["amount"])).top_k(10),
+)
+
+
+def write_csv(path):
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["user", "amount"])
+        writer.writerows((f"user-{i % 5_000}", f"{i * 7 % 1_000 / 10:.1f}") for i in range(ROWS))
+
+
+def reopened(path):
+    return [query(FileStream(path)) for _ in range(REPEATS) for query in QUERIES]
+
+
+def cached(path, storage, max_size=None):
+    stream = FileStream(path).cache(storage, max_size)
+    try:
+        return [query(stream) for _ in range(REPEATS) for query in QUERIES]
+    finally:
+        stream.close()
+
+
+CASES = {
+    "re-opened": reopened,
+    "cache(memory)": lambda path: cached(path, "memory"),
+    "cache(memory, prefix)": lambda path: cached(path, "memory", ROWS // 4),
+    "cache(disk)": lambda path: cached(path, "disk"),
+}
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = Path(tmp_dir) / "orders.csv"
+        write_csv(path)
+        expected = reopened(path)
+        print(f"{'case':<22} {'seconds':>8}")
+        for name, case in CASES.items():
+            start = time.perf_counter()
+            assert case(path) == expected
+            print(f"{name:<22} {time.perf_counter() - start:>8.2f}")
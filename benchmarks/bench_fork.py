@@ -0,0 +1,46 @@
+"""
+Several results from one CSV file: a separate FileStream per query vs. a single read with fork.
+Run with: uv run python benchmarks/bench_fork.py
+"""
+
+import csv
+import tempfile
+import time
+from pathlib import Path
+
+from pyrio import FileStream
+
+ROWS = 200_000
+
+QUERIES = (
+    lambda s: s.len(),
+    lambda s: s.map(lambda row: row["user"]).distinct().len(),
+    lambda s: s.map(lambda row: float(row["amount"])).top_k(10),
+)
+
+
+def write_csv(path):
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["user", "amount"])
+        writer.writerows((f"user-{i % 5_000}", f"{i * 7 % 1_000 / 10:.1f}") for i in range(ROWS))
+
+
+def separate(path):
+    return tuple(query(FileStream(path)) for query in QUERIES)
+
+
+def forked(path):
+    return FileStream(path).fork(*QUERIES)
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = Path(tmp_dir) / "orders.csv"
+        write_csv(path)
+        print(f"{'case':<10} {'seconds':>8}")
+        for name, case in (("separate", separate), ("fork", forked)):
+            start = time.perf_counter()
+            case(path)
+            print(f"{name:<10} {time.perf_counter() - start:>8.2f}")
+        assert separate(path) == forked(path)
@@ -0,0 +1,33 @@
+"""
+Per-element cost of element-wise pipelines: fused stages vs. one generator per stage.
+Run with: uv run python benchmarks/bench_fusion.py
+"""
+
+import timeit
+
+from pyrio import Stream
+from pyrio.iterators import StreamGenerator
+
+SIZE = 1_000_000
+
+
+def chained(stages):
+    iterable = range(SIZE)
+    for _ in range(stages):
+        iterable = StreamGenerator.map(iterable, abs)
+    return sum(1 for _ in iterable)
+
+
+def fused(stages):
+    stream = Stream(range(SIZE))
+    for _ in range(stages):
+        stream.map(abs)
+    return sum(1 for _ in stream)
+
+
+if __name__ == "__main__":
+    print(f"{'stages':>6} {'chained ns/elem':>16} {'fused ns/elem':>14}")
+    for stages in range(1, 7):
+        chained_time = min(timeit.repeat(lambda n=stages: chained(n), number=1, repeat=3))
+        fused_time = min(timeit.repeat(lambda n=stages: fused(n), number=1, repeat=3))
+        print(f"{stages:>6} {chained_time / SIZE * 1e9:>16.1f} {fused_time / SIZE * 1e9:>14.1f}")
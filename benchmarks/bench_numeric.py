@@ -0,0 +1,28 @@
+"""
+Aggregations over 10M floats: Stream.sum/average vs. the NumPy-backed NumericStream.
+Run with: uv run --extra numeric python benchmarks/bench_numeric.py
+"""
+
+import random
+import timeit
+
+from pyrio import Stream
+
+SIZE = 10_000_000
+
+
+def stream_path(data):
+    return Stream(data).sum(), Stream(data).average()
+
+
+def numeric_path(data):
+    numeric = Stream(data).to_numeric()
+    return numeric.sum(), numeric.average()
+
+
+if __name__ == "__main__":
+    data = [random.random() for _ in range(SIZE)]
+    print(f"{'path':>8} {'seconds':>8}")
+    for name, path in (("stream", stream_path), ("numeric", numeric_path)):
+        elapsed = min(timeit.repeat(lambda p=path: p(data), number=1, repeat=3))
+        print(f"{name:>8} {elapsed:>8.2f}")
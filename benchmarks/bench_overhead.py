@@ -0,0 +1,27 @@
+"""
+Per-stream overhead for small inputs: construction, short pipelines and terminal calls.
+Run with: uv run python benchmarks/bench_overhead.py
+"""
+
+import timeit
+
+from pyrio import Stream
+
+DATA = list(range(10))
+CASES = {
+    "construct": lambda: Stream(DATA),
+    "of": lambda: Stream.of(1, 2, 3),
+    "to_list": lambda: Stream(DATA).to_list(),
+    "map.filter.to_list": lambda: Stream(DATA).map(lambda x: x * 2).filter(bool).to_list(),
+    "skip.limit.sum": lambda: Stream(DATA).skip(2).limit(5).sum(),
+    "sort.take_first": lambda: Stream(DATA).sort(reverse=True).take_first(),
+    "to_dict": lambda: Stream(DATA).to_dict(lambda x: (x, x)),
+    "baseline list comprehension": lambda: [x * 2 for x in DATA if x * 2],
+}
+
+if __name__ == "__main__":
+    number = 20_000
+    print(f"{'case':<30} {'us/call':>8}")
+    for name, case in CASES.items():
+        elapsed = min(timeit.repeat(case, number=number, repeat=5))
+        print(f"{name:<30} {elapsed / number * 1e6:>8.2f}")
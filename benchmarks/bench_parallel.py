@@ -0,0 +1,40 @@
+"""
+Speedup of Stream.parallel() for a pure-Python CPU-bound mapper.
+Run with: uv run python benchmarks/bench_parallel.py
+"""
+
+import os
+import time
+
+from pyrio import Stream
+
+SIZE = 2_000
+
+
+def collatz_steps(n):
+    total = 0
+    for seed in range(n, n + 200):
+        while seed != 1:
+            seed = seed // 2 if seed % 2 == 0 else 3 * seed + 1
+            total += 1
+    return total
+
+
+def run(workers=None):
+    stream = Stream(range(1, SIZE + 1))
+    if workers:
+        stream.parallel(workers=workers)
+    start = time.perf_counter()
+    stream.map(collatz_steps).sum()
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    sequential = run()
+    print(f"{'workers':>8} {'seconds':>8} {'speedup':>8}")
+    print(f"{'-':>8} {sequential:>8.2f} {1:>8.2f}")
+    workers = 1
+    while workers <= (os.cpu_count() or 1):
+        elapsed = run(workers)
+        print(f"{workers:>8} {elapsed:>8.2f} {sequential / elapsed:>8.2f}")
+        workers *= 2
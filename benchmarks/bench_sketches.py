@@ -0,0 +1,38 @@
+"""
+Memory and throughput of exact vs. approximate distinct / count_distinct on a high-cardinality stream.
+Run with: uv run python benchmarks/bench_sketches.py
+"""
+
+import time
+import tracemalloc
+
+from pyrio import Stream
+
+SIZE = 1_000_000
+
+
+def data():
+    return (f"10.0.{i % 250}.{i % 997}-session-{i}" for i in range(SIZE))
+
+
+CASES = {
+    "distinct": lambda: sum(1 for _ in Stream(data()).distinct()),
+    "distinct(approximate)": lambda: sum(
+        1 for _ in Stream(data()).distinct(approximate=True, capacity=SIZE)
+    ),
+    "count_distinct": lambda: Stream(data()).count_distinct(),
+    "count_distinct(approximate)": lambda: Stream(data()).count_distinct(approximate=True),
+}
+
+if __name__ == "__main__":
+    print(f"{'case':<28} {'result':>9} {'seconds':>8} {'peak MB':>8}")
+    for name, case in CASES.items():
+        start = time.perf_counter()
+        result = case()
+        elapsed = time.perf_counter() - start
+        # measured in a separate run - tracing allocations slows down the pipeline
+        tracemalloc.start()
+        case()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(f"{name:<28} {result:>9} {elapsed:>8.2f} {peak / 2**20:>8.1f}")
@@ -0,0 +1,50 @@
+"""
+Peak RSS of in-memory vs. spilling hashed group_by on high-cardinality keys, for growing input sizes.
+Each case runs in a fresh interpreter so that the peak of one doesn't hide the next.
+Run with: uv run python benchmarks/bench_spill_group.py
+"""
+
+import subprocess
+import sys
+import time
+
+SIZES = (250_000, 500_000, 1_000_000, 2_000_000)
+MEMORY_LIMIT = 50_000
+
+CASE = """
+import resource, sys
+from pyrio import Stream
+
+size, memory_limit = int(sys.argv[1]), int(sys.argv[2])
+data = (f"event-{i}-payload" for i in range(size))
+result = Stream(data).group_by(
+    lambda x: int(x.split("-")[1]) % (size // 4),
+    collector=lambda k, g: (k, len(g)),
+    memory_limit=memory_limit,
+    hashed=True,
+)
+assert len(result) == size // 4
+print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+"""
+
+
+def peak_rss_mb(size, memory_limit):
+    output = subprocess.run(
+        [sys.executable, "-c", CASE, str(size), str(memory_limit)],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    # ru_maxrss is in kilobytes on Linux (bytes on macOS)
+    scale = 2**20 if sys.platform == "darwin" else 2**10
+    return int(output) / scale
+
+
+if __name__ == "__main__":
+    print(f"{'size':>10} {'in-memory MB':>13} {'spilled MB':>11} {'spilled seconds':>16}")
+    for size in SIZES:
+        in_memory = peak_rss_mb(size, size + 1)
+        start = time.perf_counter()
+        spilled = peak_rss_mb(size, MEMORY_LIMIT)
+        elapsed = time.perf_counter() - start
+        print(f"{size:>10} {in_memory:>13.1f} {spilled:>11.1f} {elapsed:>16.2f}")
@@ -0,0 +1,35 @@
+"""
+Moving aggregations: sliding_window followed by a map vs. incremental window_aggregate, for growing window sizes.
+Run with: uv run python benchmarks/bench_window.py
+"""
+
+import time
+from functools import partial
+
+from pyrio import Stream
+
+SIZE = 200_000
+WINDOWS = (10, 100, 1_000)
+
+
+def measure(build):
+    start = time.perf_counter()
+    build().for_each(id)
+    return time.perf_counter() - start
+
+
+def naive(window, func):
+    return Stream(iter(range(SIZE))).sliding_window(window).map(func)
+
+
+def incremental(window, agg):
+    return Stream(iter(range(SIZE))).window_aggregate(window, agg=agg)
+
+
+if __name__ == "__main__":
+    print(f"{'window':>7} {'agg':>5} {'sliding_window':>15} {'window_aggregate':>17}")
+    for window in WINDOWS:
+        for name, func in (("mean", lambda w: sum(w) / len(w)), ("max", max)):
+            copied = measure(partial(naive, window, func))
+            updated = measure(partial(incremental, window, name))
+            print(f"{window:>7} {name:>5} {copied:>15.2f} {updated:>17.2f}")
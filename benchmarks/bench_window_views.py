@@ -0,0 +1,81 @@
+"""
+Copied (tuple) vs. zero-copy (view) sliding windows over a 10M-element input, for a consumer that only reads them.
+Counts the window objects the stage allocates and their total size, times the pipeline
+and records the tracemalloc peak of a separate run.
+Run with: uv run python benchmarks/bench_window_views.py
+"""
+
+import sys
+import time
+import tracemalloc
+
+from pyrio import Stream
+
+SIZE = 10_000_000
+# views over bytes are memoryview slices - a new (constant-size) object per step, so they pay off on wider windows
+WINDOWS = {"generator": 8, "bytes": 64}
+
+
+def generator_source():
+    return (i % 11 for i in range(SIZE))
+
+
+def bytes_source():
+    return bytes(i % 251 for i in range(SIZE))
+
+
+class AllocationCounter:
+    """Counts the distinct window objects passing through and sums their sizes"""
+
+    def __init__(self):
+        self.objects = 0
+        self.bytes = 0
+        self._last = None
+
+    def __call__(self, window):
+        if window is not self._last:
+            self._last = window
+            self.objects += 1
+            self.bytes += sys.getsizeof(window)
+
+
+def run(source, copy, counter=None):
+    window = WINDOWS["bytes" if isinstance(source, bytes) else "generator"]
+    stream = Stream(source).sliding_window(window, copy=copy)
+    if counter is not None:
+        stream = stream.peek(counter)
+    # windows starting with a larger element than the one they end with
+    return stream.filter(lambda w: w[0] > w[-1]).len()
+
+
+CASES = {
+    "generator, copy=True": (generator_source, True),
+    "generator, copy=False": (generator_source, False),
+    "bytes, copy=True": (bytes_source, True),
+    "bytes, copy=False": (bytes_source, False),
+}
+
+if __name__ == "__main__":
+    print(
+        f"{'case':<22} {'result':>8} {'seconds':>8} {'windows allocated':>18} "
+        f"{'window MB':>10} {'peak KB':>8}"
+    )
+    for name, (source, copy) in CASES.items():
+        data = source()
+        start = time.perf_counter()
+        result = run(data, copy)
+        elapsed = time.perf_counter() - start
+
+        counter = AllocationCounter()
+        run(source(), copy, counter)
+
+        # the source is created before tracing - only the pipeline is measured
+        data = source()
+        tracemalloc.start()
+        run(data, copy)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(
+            f"{name:<22} {result:>8} {elapsed:>8.2f} {counter.objects:>18} "
+            f"{counter.bytes / 2**20:>10.1f} {peak / 2**10:>8.1f}"
+        )
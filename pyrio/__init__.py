@@ -1,6 +1,7 @@
 from .streams.stream import Stream as Stream
 from .streams.file_stream import FileStream as FileStream
+from .streams.async_stream import AsyncStream as AsyncStream
 from .utils.optional import Optional as Optional
 from .utils.dict_item import DictItem as DictItem
 
-__all__ = ["Stream", "FileStream", "Optional", "DictItem"]
+__all__ = ["Stream", "FileStream", "AsyncStream", "Optional", "DictItem"]
@@ -0,0 +1,16 @@
+from .collector import (
+    Collector as Collector,
+    to_list as to_list,
+    to_set as to_set,
+    counting as counting,
+    summing as summing,
+    averaging as averaging,
+    min_by as min_by,
+    max_by as max_by,
+    joining as joining,
+    mapping as mapping,
+    filtering as filtering,
+    grouping_by as grouping_by,
+    partitioning_by as partitioning_by,
+    teeing as teeing,
+)
@@ -0,0 +1,195 @@
+from pyrio.utils import Optional
+
+_MISSING = object()
+
+
+class Collector:
+    """
+    Reduction operation in the style of Java's Collectors, applied by 'Stream.collect' in a single pass:
+    'supplier()' creates the initial state, 'accumulator(state, element)' returns the updated state
+    and 'finisher(state)' turns the final state into the result
+    """
+
+    __slots__ = ("supplier", "accumulator", "finisher")
+
+    def __init__(self, supplier, accumulator, finisher=None):
+        self.supplier = supplier
+        self.accumulator = accumulator
+        self.finisher = (lambda state: state) if finisher is None else finisher
+
+    def collect(self, iterable):
+        """Reduces the elements of the iterable to the result of the collector"""
+        accumulate = self.accumulator
+        state = self.supplier()
+        for element in iterable:
+            state = accumulate(state, element)
+        return self.finisher(state)
+
+    def __repr__(self):
+        return f"Collector({getattr(self.supplier, '__qualname__', self.supplier)})"
+
+
+def _append(state, element):
+    state.append(element)
+    return state
+
+
+def _add(state, element):
+    state.add(element)
+    return state
+
+
+def to_list():
+    """Collects the elements into a list"""
+    return Collector(list, _append)
+
+
+def to_set():
+    """Collects the elements into a set"""
+    return Collector(set, _add)
+
+
+def counting():
+    """Counts the elements"""
+    return Collector(int, lambda count, _: count + 1)
+
+
+def summing(mapper=None):
+    """Sums the elements (or the values returned by the mapper for them)"""
+    if mapper is None:
+        return Collector(int, lambda total, element: total + element)
+    return Collector(int, lambda total, element: total + mapper(element))
+
+
+def averaging(mapper=None):
+    """Returns the arithmetic mean of the elements (or of the values returned by the mapper), 0 if there are none"""
+    mapper = (lambda x: x) if mapper is None else mapper
+
+    def accumulate(state, element):
+        state[0] += mapper(element)
+        state[1] += 1
+        return state
+
+    return Collector(
+        lambda: [0, 0], accumulate, lambda state: state[0] / state[1] if state[1] else 0
+    )
+
+
+def min_by(comparator=None):
+    """Returns an Optional with the minimum element according to the comparator (key function)"""
+    return _extreme(comparator, lambda new, current: new < current)
+
+
+def max_by(comparator=None):
+    """Returns an Optional with the maximum element according to the comparator (key function)"""
+    return _extreme(comparator, lambda new, current: new > current)
+
+
+def _extreme(comparator, better):
+    # the state is (key, element) - keeps the first of equal elements, like min() and max()
+    comparator = (lambda x: x) if comparator is None else comparator
+
+    def accumulate(state, element):
+        key = comparator(element)
+        if state is _MISSING or better(key, state[0]):
+            return key, element
+        return state
+
+    return Collector(
+        lambda: _MISSING,
+        accumulate,
+        lambda state: Optional.empty() if state is _MISSING else Optional.of_nullable(state[1]),
+    )
+
+
+def joining(delimiter="", prefix="", suffix=""):
+    """Concatenates the string representations of the elements, separated by the delimiter"""
+    return Collector(
+        list,
+        lambda parts, element: _append(parts, str(element)),
+        lambda parts: f"{prefix}{delimiter.join(parts)}{suffix}",
+    )
+
+
+def mapping(mapper, downstream):
+    """Applies the mapper to each element before passing it to the downstream collector"""
+    accumulate = downstream.accumulator
+    return Collector(
+        downstream.supplier,
+        lambda state, element: accumulate(state, mapper(element)),
+        downstream.finisher,
+    )
+
+
+def filtering(predicate, downstream):
+    """Passes to the downstream collector only the elements matching the predicate"""
+    accumulate = downstream.accumulator
+    return Collector(
+        downstream.supplier,
+        lambda state, element: accumulate(state, element) if predicate(element) else state,
+        downstream.finisher,
+    )
+
+
+def grouping_by(classifier, downstream=None):
+    """
+    Groups the elements by the key returned by the classifier in a hash table (in first-seen key order),
+    reducing each group with the downstream collector (a list by default)
+    """
+    downstream = to_list() if downstream is None else downstream
+    supplier, accumulate, finish = downstream.supplier, downstream.accumulator, downstream.finisher
+
+    def accumulate_group(groups, element):
+        key = classifier(element)
+        state = groups.get(key, _MISSING)
+        groups[key] = accumulate(supplier() if state is _MISSING else state, element)
+        return groups
+
+    return Collector(
+        dict,
+        accumulate_group,
+        lambda groups: {key: finish(state) for key, state in groups.items()},
+    )
+
+
+def partitioning_by(predicate, downstream=None):
+    """
+    Splits the elements into {True: ..., False: ...} according to the predicate,
+    reducing each part with the downstream collector (a list by default)
+    """
+    downstream = to_list() if downstream is None else downstream
+    accumulate, finish = downstream.accumulator, downstream.finisher
+
+    def accumulate_part(parts, element):
+        key = bool(predicate(element))
+        parts[key] = accumulate(parts[key], element)
+        return parts
+
+    return Collector(
+        lambda: {True: downstream.supplier(), False: downstream.supplier()},
+        accumulate_part,
+        lambda parts: {key: finish(state) for key, state in parts.items()},
+    )
+
+
+def teeing(*downstreams, merger=None):
+    """
+    Passes every element to each of the downstream collectors - evaluating several reductions in a single pass.
+    Returns a tuple of their results or the value of 'merger' called with them
+    """
+    if not downstreams:
+        raise ValueError("At least one collector is required")
+    accumulators = tuple(collector.accumulator for collector in downstreams)
+
+    def accumulate(states, element):
+        for idx, accumulate_one in enumerate(accumulators):
+            states[idx] = accumulate_one(states[idx], element)
+        return states
+
+    def finish(states):
+        results = tuple(collector.finisher(state) for collector, state in zip(downstreams, states))
+        return results if merger is None else merger(*results)
+
+    return Collector(
+        lambda: [collector.supplier() for collector in downstreams], accumulate, finish
+    )
@@ -1,66 +1,114 @@
+import inspect
 from functools import wraps
 
 from pyrio.exceptions import IllegalStateError
 
-TERMINAL_FUNCTIONS = [
-    "for_each",
-    "reduce",
-    "count",
-    "min",
-    "max",
-    "sum",
-    "average",
-    "find_first",
-    "find_any",
-    "take_first",
-    "take_last",
-    "take_nth",
-    "any_match",
-    "all_match",
-    "none_match",
-    "compare_with",
-    "all_equal",
-    "quantify",
-    "group_by",
-    "collect",
-    "to_list",
-    "to_tuple",
-    "to_set",
-    "to_dict",
-    "to_string",
-    "save",
-]
+TERMINAL_FUNCTIONS = frozenset(
+    {
+        "for_each",
+        "fork",
+        "reduce",
+        "count",
+        "count_distinct",
+        "min",
+        "max",
+        "top_k",
+        "sum",
+        "average",
+        "summary_statistics",
+        "find_first",
+        "find_any",
+        "take_first",
+        "take_last",
+        "take_nth",
+        "any_match",
+        "all_match",
+        "none_match",
+        "compare_with",
+        "all_equal",
+        "quantify",
+        "group_by",
+        "aggregate_by",
+        "collect",
+        "to_list",
+        "to_tuple",
+        "to_set",
+        "to_numeric",
+        "to_dict",
+        "to_string",
+        "save",
+    }
+)
 
 
 def pre_call(function_decorator):
-    """Applies a function decorator to all callable methods"""
+    """Applies a function decorator to all callable methods (static and private methods excluded)"""
 
     def decorator(cls):
         for name, obj in vars(cls).items():
-            if callable(obj):
-                setattr(cls, name, function_decorator(obj))
+            if not callable(obj) or isinstance(obj, staticmethod) or _is_private(name):
+                continue
+            setattr(cls, name, function_decorator(obj))
         return cls
 
     return decorator
 
 
+def _is_private(name):
+    return name.startswith("_") and not (name.startswith("__") and name.endswith("__"))
+
+
 def handle_consumed(func):
-    """Prevents operations on consumed streams and auto-closes after terminal operations"""
+    """
+    Prevents operations on consumed streams and auto-closes after terminal operations (cached streams are rewound).
+    Whether the method is a terminal operation is resolved once, when the class is decorated
+    """
+    if func.__name__ in ("__init__", "close"):
+        return func
+    if inspect.iscoroutinefunction(func):
+        return _handle_consumed_async(func)
+    if func.__name__ in TERMINAL_FUNCTIONS:
+        return _handle_terminal(func)
 
     @wraps(func)
-    def wrapper(*args, **kw):
-        from pyrio.streams.base_stream import BaseStream
+    def wrapper(stream, *args, **kw):
+        if stream._is_consumed:  # noqa
+            raise IllegalStateError("Stream object already consumed")
+        return func(stream, *args, **kw)
+
+    return wrapper
 
-        stream = args[0] if args else None
-        if not (stream and isinstance(stream, BaseStream)):
-            return func(*args, **kw)  # pragma: no cover
 
-        is_consumed = getattr(stream, "_is_consumed", None)
-        if is_consumed and func.__name__ != "close":
+def _handle_terminal(func):
+    @wraps(func)
+    def wrapper(stream, *args, **kw):
+        if stream._is_consumed:  # noqa
+            raise IllegalStateError("Stream object already consumed")
+        is_cached = bool(getattr(stream, "_caches", None))
+        try:
+            result = func(stream, *args, **kw)
+        finally:
+            if is_cached:
+                # a cached stream is rewound to its cache instead of being consumed - even if the operation failed
+                stream._rewind()  # noqa
+        if not is_cached:
+            stream.close()
+        return result
+
+    return wrapper
+
+
+def _handle_consumed_async(func):
+    # counterpart of handle_consumed for coroutine methods of AsyncStream
+    is_terminal = func.__name__ in TERMINAL_FUNCTIONS
+
+    @wraps(func)
+    async def wrapper(stream, *args, **kw):
+        if stream._is_consumed:  # noqa
             raise IllegalStateError("Stream object already consumed")
 
-        result = func(*args, **kw)
-        if not is_consumed and func.__name__ in TERMINAL_FUNCTIONS:
+        result = await func(stream, *args, **kw)
+        if is_terminal:
             stream.close()
         return result
 
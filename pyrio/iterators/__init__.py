@@ -1,2 +1,4 @@
 from .stream_generator import StreamGenerator as StreamGenerator
 from .itertools_mixin import ItertoolsMixin as ItertoolsMixin
+from .concurrent_generator import ConcurrentGenerator as ConcurrentGenerator
+from .async_stream_generator import AsyncStreamGenerator as AsyncStreamGenerator
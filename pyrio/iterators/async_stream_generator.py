@@ -0,0 +1,148 @@
+import inspect
+from collections import deque
+
+
+class AsyncStreamGenerator:
+    """Helper class wrapping async generator-based operations; functions may be sync or coroutine functions"""
+
+    @staticmethod
+    async def from_iterable(iterable):
+        """Yields the elements of a sync or async iterable"""
+        if hasattr(iterable, "__aiter__"):
+            async for i in iterable:
+                yield i
+        else:
+            for i in iterable:
+                yield i
+
+    @classmethod
+    async def concat(cls, *iterables):
+        """Concatenates multiple sync or async iterables into a single sequence"""
+        for iterable in iterables:
+            async for i in cls.from_iterable(iterable):
+                yield i
+
+    @staticmethod
+    async def filter(aiterable, predicate):
+        """Yields elements that satisfy the predicate"""
+        async for i in aiterable:
+            if await resolve(predicate(i)):
+                yield i
+
+    @staticmethod
+    async def map(aiterable, mapper):
+        """Applies mapper function to each element"""
+        async for i in aiterable:
+            yield await resolve(mapper(i))
+
+    @staticmethod
+    async def map_concurrent(aiterable, mapper, concurrency, ordered=True):
+        """Applies mapper function to the elements running at most 'concurrency' calls at a time"""
+        import asyncio
+
+        async def _call(item):
+            return await resolve(mapper(item))
+
+        async def _collect():
+            if ordered:
+                return (await pending.popleft(),)
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                pending.remove(task)
+            return [task.result() for task in done]
+
+        pending = deque()
+        try:
+            async for i in aiterable:
+                if len(pending) >= concurrency:
+                    for result in await _collect():
+                        yield result
+                pending.append(asyncio.ensure_future(_call(i)))
+            while pending:
+                for result in await _collect():
+                    yield result
+        finally:
+            for task in pending:
+                task.cancel()
+
+    @staticmethod
+    async def filter_map(aiterable, mapper, discard_falsy=False):
+        """Filters out None (or falsy) values and applies mapper to remaining elements"""
+        async for i in aiterable:
+            if (not discard_falsy and i is not None) or (discard_falsy and i):
+                yield await resolve(mapper(i))
+
+    @classmethod
+    async def flat_map(cls, aiterable, mapper):
+        """Applies mapper and flattens the resulting sync or async iterables"""
+        async for i in aiterable:
+            async for j in cls.from_iterable(await resolve(mapper(i))):
+                yield j
+
+    @staticmethod
+    async def peek(aiterable, operation):
+        """Performs operation on each element without consuming the stream"""
+        async for i in aiterable:
+            await resolve(operation(i))
+            yield i
+
+    @staticmethod
+    async def distinct(aiterable):
+        """Yields unique elements preserving first occurrence order"""
+        elements = set()
+        async for i in aiterable:
+            if i not in elements:
+                elements.add(i)
+                yield i
+
+    @staticmethod
+    async def skip(aiterable, count):
+        """Skips first n elements and yields the rest"""
+        async for i in aiterable:
+            if count > 0:
+                count -= 1
+            else:
+                yield i
+
+    @staticmethod
+    async def limit(aiterable, count):
+        """Yields at most n elements"""
+        if count == 0:
+            return
+        async for i in aiterable:
+            yield i
+            count -= 1
+            if count == 0:
+                break
+
+    @staticmethod
+    async def take_while(aiterable, predicate):
+        """Yields elements while predicate is true"""
+        async for i in aiterable:
+            if not await resolve(predicate(i)):
+                break
+            yield i
+
+    @staticmethod
+    async def drop_while(aiterable, predicate):
+        """Skips elements while predicate is true, then yields the rest"""
+        dropping = True
+        async for i in aiterable:
+            if dropping and await resolve(predicate(i)):
+                continue
+            dropping = False
+            yield i
+
+    @staticmethod
+    async def enumerate(aiterable, start=0):
+        """Yields index-element pairs starting from given index"""
+        async for i in aiterable:
+            yield start, i
+            start += 1
+
+
+async def resolve(value):
+    """Awaits the value if it is awaitable (e.g. returned by a coroutine function)"""
+    if inspect.isawaitable(value):
+        return await value
+    return value
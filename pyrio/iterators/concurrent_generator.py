@@ -0,0 +1,165 @@
+import itertools as it
+from collections import deque
+from functools import partial
+
+from pyrio.iterators.stream_generator import StreamGenerator
+
+# element-wise stages that can be executed in worker processes
+PARALLEL_STAGES = {"map", "filter", "filter_map", "flat_map"}
+# number of chunks in flight per worker
+CHUNKS_PER_WORKER = 2
+# largest chunk of elements passed at once to the branches of a broadcast
+BROADCAST_CHUNK_SIZE = 256
+
+
+class ConcurrentGenerator:
+    """Helper class running stream operations on executors with a bounded number of tasks in flight"""
+
+    @classmethod
+    def process(cls, iterable, stages, workers=None, ordered=True, chunk_size=None):
+        """
+        Applies element-wise (name, args) stages on chunks of the iterable in a process pool
+        and yields the results; stage functions (and elements) must be picklable
+        """
+        import os
+        from concurrent.futures import ProcessPoolExecutor
+
+        workers = workers or os.cpu_count() or 1
+        chunk_size = chunk_size or cls._chunk_size(iterable, workers)
+        iterator = iter(iterable)
+        chunks = iter(lambda: tuple(it.islice(iterator, chunk_size)), ())
+
+        executor = ProcessPoolExecutor(workers)
+        try:
+            task = partial(_process_chunk, stages)
+            for result in cls._run_bounded(
+                executor, task, chunks, workers * CHUNKS_PER_WORKER, ordered
+            ):
+                yield from result
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    @classmethod
+    def map_concurrent(cls, iterable, mapper, max_workers=None, ordered=True, max_in_flight=None):
+        """
+        Applies mapper to the elements in a thread pool, keeping at most 'max_in_flight' calls pending
+        (by default twice the number of workers) so that memory stays constant even on infinite iterables
+        """
+        import os
+        from concurrent.futures import ThreadPoolExecutor
+
+        max_workers = max_workers or min(32, (os.cpu_count() or 1) + 4)
+        executor = ThreadPoolExecutor(max_workers)
+        try:
+            yield from cls._run_bounded(
+                executor, mapper, iterable, max_in_flight or max_workers * 2, ordered
+            )
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    @staticmethod
+    def broadcast(iterable, consumers, buffer_size=1_024):
+        """
+        Reads the iterable once and feeds every element to each of the consumers - functions receiving an iterable
+        and returning a result - running each in its own thread. The elements are passed in chunks through
+        bounded queues of about 'buffer_size' elements per consumer: a slow consumer blocks the reading
+        (backpressure) instead of growing the memory. Returns the list of the results of the consumers
+        """
+        from concurrent.futures import ThreadPoolExecutor
+
+        chunk_size = min(BROADCAST_CHUNK_SIZE, buffer_size)
+        branches = [_Branch(max(1, buffer_size // chunk_size)) for _ in consumers]
+        executor = ThreadPoolExecutor(len(branches))
+        try:
+            futures = [executor.submit(branch.run, f) for branch, f in zip(branches, consumers)]
+            iterator = iter(iterable)
+            for chunk in iter(lambda: list(it.islice(iterator, chunk_size)), []):
+                # stop reading once every consumer has finished (or one has failed)
+                if all(branch.done for branch in branches) or any(
+                    future.done() and future.exception() for future in futures
+                ):
+                    break
+                for branch in branches:
+                    branch.put(chunk)
+        finally:
+            # also reached if reading fails - the consumers are unblocked and their results discarded
+            for branch in branches:
+                branch.put(_END)
+            executor.shutdown()
+        return [future.result() for future in futures]
+
+    @staticmethod
+    def _chunk_size(iterable, workers, default=256):
+        try:
+            # aim at a few chunks per worker to balance the load
+            return max(1, min(default, -(-len(iterable) // (workers * CHUNKS_PER_WORKER * 2))))
+        except TypeError:
+            return default
+
+    @staticmethod
+    def _run_bounded(executor, task, items, max_in_flight, ordered=True):
+        """Yields task(item) results keeping at most 'max_in_flight' tasks submitted to the executor"""
+        from concurrent.futures import FIRST_COMPLETED, wait
+
+        in_flight = deque()
+
+        def _collect():
+            if ordered:
+                return (in_flight.popleft().result(),)
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                in_flight.remove(future)
+            return [future.result() for future in done]
+
+        try:
+            for item in items:
+                if len(in_flight) >= max_in_flight:
+                    yield from _collect()
+                in_flight.append(executor.submit(task, item))
+            while in_flight:
+                yield from _collect()
+        finally:
+            for future in in_flight:
+                future.cancel()
+
+
+def _process_chunk(stages, chunk):
+    # runs in the worker process
+    iterable = chunk
+    for name, args in stages:
+        iterable = getattr(StreamGenerator, name)(iterable, *args)
+    return list(iterable)
+
+
+_END = object()
+
+
+class _Branch:
+    """Bounded queue of chunks feeding a consumer of a broadcast"""
+
+    def __init__(self, max_chunks):
+        import queue
+
+        self._queue = queue.Queue(max_chunks)
+        self.done = False
+
+    def run(self, consumer):
+        try:
+            return consumer(self._elements())
+        finally:
+            self.done = True
+
+    def _elements(self):
+        while (chunk := self._queue.get()) is not _END:
+            yield from chunk
+
+    def put(self, chunk):
+        import queue
+
+        # blocks while the queue is full - unless the consumer has already returned
+        while not self.done:
+            try:
+                self._queue.put(chunk, timeout=0.05)
+                return
+            except queue.Full:
+                continue
@@ -1,92 +1,87 @@
 import itertools as it
 import operator
-from functools import wraps
+from collections.abc import Sequence, Sized
 
 from pyrio.exceptions import MethodNotFoundError
 from pyrio.utils import Optional
 
 
 class ItertoolsMixin:
-    """Provides integration with itertools methods. Pass corresponding parameters as kwargs"""
+    """Provides integration with itertools methods. Pass corresponding parameters as args or kwargs"""
 
     iterable = None
+    _iterable = None
+    _plan = None
 
     def __getattr__(self, item):
-        func = getattr(it, item, None)
-        if func is None:
-            raise MethodNotFoundError(f"'{item}' not found")
-
-        @wraps(func)
-        def wrapper(**kwargs):
-            return self._integrate(func, **kwargs)
-
-        return wrapper
-
-    def _integrate(self, it_func, **kwargs):
-        match it_func.__name__:
-            # handle functions that take no kwargs
-            case "islice" | "repeat" | "tee" | "chain":
-                self.iterable = it_func(self.iterable, *kwargs.values())
-            case "dropwhile" | "filterfalse" | "starmap" | "takewhile" | "islice" | "repeat":
-                self.iterable = it_func(*kwargs.values(), self.iterable)
-            # mixed
-            case "product" | "zip_longest":
-                self.iterable = it_func(*self.iterable, **kwargs)
-            case _:
-                import inspect
-
-                try:
-                    parameters = inspect.signature(it_func).parameters
-                except ValueError:
-                    parameters = {}
-
-                # only iterable as arg
-                if len(parameters) == 1 and "iterable" in parameters:
-                    self.iterable = it_func(self.iterable)
-                # all kwargs
-                else:
-                    if sequence := next(
-                        (name for name in {"iterable", "data"} if name in parameters), None
-                    ):
-                        kwargs[sequence] = self.iterable
-                    self.iterable = it_func(**kwargs)
-
-        return self
+        # itertools functions are attached as methods below - anything else is missing
+        raise MethodNotFoundError(f"'{item}' not found")
 
     # ### 'recipes' ###
     # https://docs.python.org/3/library/itertools.html#itertools-recipes
     def tabulate(self, mapper, start=0):
         """Returns function(0), function(1), ..."""
-        self.iterable = map(mapper, it.count(start))
+        self._plan.add("tabulate", mapper, start, func=self._tabulate)
         return self
 
+    @staticmethod
+    def _tabulate(iterable, mapper, start=0):
+        return map(mapper, it.count(start))
+
     def repeat_func(self, operation, times=None):
         """Repeats calls to func with specified arguments"""
-        self.iterable = it.starmap(operation, it.repeat(self.iterable, times=times))
+        self._plan.add("repeat_func", operation, times, func=self._repeat_func)
         return self
 
+    @staticmethod
+    def _repeat_func(iterable, operation, times=None):
+        return it.starmap(operation, it.repeat(iterable, times=times))
+
     def ncycles(self, count=0):
         """Returns the stream elements n times"""
-        self.iterable = it.chain.from_iterable(it.repeat(tuple(self.iterable), count))
+        self._plan.add("ncycles", count, func=self._ncycles)
         return self
 
+    @staticmethod
+    def _ncycles(iterable, count=0):
+        return it.chain.from_iterable(it.repeat(tuple(iterable), count))
+
     def consume(self, n=None):
         """Advances the iterator n-steps ahead. If n is None, consumes stream entirely"""
+        if n is not None and n < 0:
+            raise ValueError("Consume boundary cannot be negative")
+        self._plan.add("consume", n, func=self._consume)
+        return self
+
+    @staticmethod
+    def _consume(iterable, n=None):
         import collections
 
         if n is None:
-            self.iterable = collections.deque(self.iterable, maxlen=0)
-            return self
-        if n < 0:
-            raise ValueError("Consume boundary cannot be negative")
-        self.iterable = it.islice(self.iterable, n, len(self.iterable))
-        return self
+            return collections.deque(iterable, maxlen=0)
+        return it.islice(iterable, n, None)
 
     def take_nth(self, idx, default=None):
-        """Returns Optional with the nth element of the stream or a default value"""
+        """
+        Returns Optional with the nth element of the stream or a default value.
+        Negative indices of a stream with unknown size keep only the last -idx elements in memory
+        """
+        from pyrio.pipeline import EXACT
+
+        hint = self._plan.size_hint(self._iterable)
+        if isinstance(iterable := self.iterable, Sequence):
+            in_range = -len(iterable) <= idx < len(iterable)
+            return Optional.of_nullable(iterable[idx] if in_range else default)
         if idx < 0:
-            idx = len(self.iterable) + idx
-        return Optional.of_nullable(next(it.islice(self.iterable, idx, None), default))
+            if hint.kind != EXACT:
+                import collections
+
+                window = collections.deque(iterable, maxlen=-idx)
+                return Optional.of_nullable(window[0] if len(window) == -idx else default)
+            idx = hint.size + idx
+            if idx < 0:
+                return Optional.of_nullable(default)
+        return Optional.of_nullable(next(it.islice(iterable, idx, None), default))
 
     def all_equal(self, key=None):
         """Returns True if all elements of the stream are equal to each other"""
@@ -94,36 +89,76 @@ class ItertoolsMixin:
 
     def view(self, start=0, stop=None, step=None):
         """Provides access to a selected part of the stream"""
-        if start < 0:
-            start = len(self.iterable) + start
-
-        if stop and stop < 0:
-            stop = len(self.iterable) + stop
-
         if step and step < 0:
             raise ValueError("Step must be a positive integer or None")
+        if start < 0 or (stop is not None and stop < 0):
+            from pyrio.pipeline import EXACT
 
-        self.iterable = it.islice(self.iterable, start, stop, step)
+            # resolve negative indices in advance if the size of the stream is known
+            if (hint := self._plan.size_hint(self._iterable)).kind == EXACT:
+                start, stop, _ = slice(start, stop).indices(hint.size)
+        self._plan.add("view", start, stop, step, func=self._view)
         return self
 
+    @classmethod
+    def _view(cls, iterable, start=0, stop=None, step=None):
+        if start >= 0 and (stop is None or stop >= 0):
+            return it.islice(iterable, start, stop, step)
+        if isinstance(iterable, Sized):
+            start, stop, _ = slice(start, stop).indices(len(iterable))
+            return it.islice(iterable, start, stop, step)
+        return cls._view_from_end(iterable, start, stop, step)
+
+    @staticmethod
+    def _view_from_end(iterable, start, stop, step):
+        # negative indices of an iterator with unknown length - buffers at most -start or -stop elements
+        import collections
+
+        if start < 0:
+            window = collections.deque(maxlen=-start)
+            count = 0
+            for x in iterable:
+                window.append(x)
+                count += 1
+            offset = count - len(window)
+            start, stop, _ = slice(start, stop).indices(count)
+            yield from it.islice(window, start - offset, max(stop - offset, 0), step)
+            return
+
+        # stop < 0 - an element is yielded once it is known not to be among the last -stop ones
+        buffer = collections.deque()
+        for x in iterable:
+            buffer.append(x)
+            if len(buffer) > -stop:
+                element = buffer.popleft()
+                if start == 0:
+                    yield element
+                    start = (step or 1) - 1
+                else:
+                    start -= 1
+
     # ### unique ###
     def unique(self, key=None, reverse=False):
         """Yields unique elements in sorted order. Supports unhashable inputs"""
-        self.iterable = self._unique(sorted(self.iterable, key=key, reverse=reverse), key=key)
+        self._plan.add("unique", key, reverse, func=self._unique)
         return self
 
-    @staticmethod
-    def _unique(iterable, key=None):
-        return map(next, map(operator.itemgetter(1), it.groupby(iterable, key)))
+    @classmethod
+    def _unique(cls, iterable, key=None, reverse=False):
+        return cls._unique_just_seen(sorted(iterable, key=key, reverse=reverse), key)
 
     def unique_just_seen(self, key=None):
         """Yields unique elements, preserving order. Remembers only the element just seen"""
-        self.iterable = map(next, map(operator.itemgetter(1), it.groupby(self.iterable, key)))
+        self._plan.add("unique_just_seen", key, func=self._unique_just_seen)
         return self
 
+    @staticmethod
+    def _unique_just_seen(iterable, key=None):
+        return map(next, map(operator.itemgetter(1), it.groupby(iterable, key)))
+
     def unique_ever_seen(self, key=None):
         """Yields unique elements, preserving order. Remembers all elements ever seen"""
-        self.iterable = self._unique_ever_seen(self.iterable, key)
+        self._plan.add("unique_ever_seen", key, func=self._unique_ever_seen)
         return self
 
     @staticmethod
@@ -136,29 +171,64 @@ class ItertoolsMixin:
                 yield element
 
     # ### ###
-    def sliding_window(self, n):
-        """Collects data into overlapping fixed-length chunks or blocks"""
+    def sliding_window(self, n, copy=True):
+        """
+        Collects data into overlapping fixed-length chunks or blocks.
+        With copy=False yields a read-only view instead of a new tuple on every step - valid until the next step
+        (memoryview slices for bytes, bytearray and array sources, a shifting view over a circular buffer otherwise)
+        """
         if n < 0:
             raise ValueError("Window size cannot be negative")
-        self.iterable = self._sliding_window(self.iterable, n)
+        self._plan.add("sliding_window", n, copy, func=self._sliding_window)
         return self
 
+    @classmethod
+    def _sliding_window(cls, iterable, n, copy=True):
+        if copy:
+            return cls._sliding_window_copy(iterable, n)
+        return cls._sliding_window_view(iterable, n)
+
     @staticmethod
-    def _sliding_window(iterable, n):
+    def _sliding_window_copy(iterable, n):
         import collections
 
-        window = collections.deque(it.islice(iterable, n - 1), maxlen=n)
-        for x in it.islice(iterable, n - 1, len(iterable)):
+        iterator = iter(iterable)
+        window = collections.deque(it.islice(iterator, n - 1), maxlen=n)
+        for x in iterator:
             window.append(x)
             yield tuple(window)
 
+    @staticmethod
+    def _sliding_window_view(iterable, n):
+        import array
+        import collections
+
+        from pyrio.pipeline.sequence_view import WindowView
+
+        if n < 1:
+            return
+        if isinstance(iterable, (bytes, bytearray, memoryview, array.array)):
+            view = memoryview(iterable).toreadonly()
+            for start in range(len(view) - n + 1):
+                yield view[start : start + n]
+            return
+
+        iterator = iter(iterable)
+        window = WindowView(it.islice(iterator, n - 1), maxlen=n)
+        # the view itself is read-only - shift it through the unbound deque method
+        shift = collections.deque.append
+        for x in iterator:
+            shift(window, x)
+            yield window
+
     def grouper(self, n, *, incomplete="fill", fill_value=None):
         """Collects data into non-overlapping fixed-length chunks or blocks"""
-        self.iterable = self._grouper(n, incomplete, fill_value)
+        self._plan.add("grouper", n, incomplete, fill_value, func=self._grouper)
         return self
 
-    def _grouper(self, n, incomplete="fill", fill_value=None):
-        iterators = [iter(self.iterable)] * n
+    @staticmethod
+    def _grouper(iterable, n, incomplete="fill", fill_value=None):
+        iterators = [iter(iterable)] * n
         match incomplete:
             case "fill":
                 return it.zip_longest(*iterators, fillvalue=fill_value)
@@ -173,7 +243,7 @@ class ItertoolsMixin:
 
     def round_robin(self):
         """Visits input iterables in a cycle until each is exhausted"""
-        self.iterable = self._round_robin(self.iterable)
+        self._plan.add("round_robin", func=self._round_robin)
         return self
 
     @staticmethod
@@ -184,24 +254,94 @@ class ItertoolsMixin:
             iterators = it.cycle(it.islice(iterators, num_active))
             yield from map(next, iterators)
 
-    def partition(self, predicate):
+    def partition(self, predicate, collector=None, sinks=None):
+        """
+        Partitions entries into true and false entries in a single pass.
+        Returns a stream of two lists (or of the results of the 'collector' for each part);
+        if a pair of 'sinks' callables is given, the entries are pushed to them instead
+        and the stream holds the number of entries in each part
+        """
+        self._validate_buckets(2, collector, sinks)
+        self._plan.add("partition", predicate, collector, sinks, func=self._partition)
+        return self
+
+    @classmethod
+    def _partition(cls, iterable, predicate, collector=None, sinks=None):
+        return cls._partition_by(iterable, lambda x: 0 if predicate(x) else 1, 2, collector, sinks)
+
+    def partition_by(self, classifier, n_buckets, collector=None, sinks=None):
         """
-        Partitions entries into true and false entries.
-        Returns a stream of two nested generators
+        Routes each entry to the bucket whose index (between 0 and n_buckets - 1) is returned by the classifier.
+        Returns a stream of 'n_buckets' lists (or of the results of the 'collector' for each bucket);
+        if 'sinks' callables are given (one per bucket), the entries are pushed to them instead
+        and the stream holds the number of entries in each bucket
         """
-        true_iter, false_iter = it.tee(self.iterable)
-        self.iterable = filter(predicate, true_iter), it.filterfalse(predicate, false_iter)
+        if n_buckets < 1:
+            raise ValueError("Buckets count must be positive")
+        self._validate_buckets(n_buckets, collector, sinks)
+        self._plan.add(
+            "partition_by", classifier, n_buckets, collector, sinks, func=self._partition_by
+        )
         return self
 
+    @staticmethod
+    def _validate_buckets(n_buckets, collector, sinks):
+        if sinks is None:
+            return
+        if collector is not None:
+            raise ValueError("Cannot use both a collector and sinks")
+        if len(sinks) != n_buckets:
+            raise ValueError(f"Expected {n_buckets} sinks, got {len(sinks)}")
+
+    @staticmethod
+    def _partition_by(iterable, classifier, n_buckets, collector=None, sinks=None):
+        def bucket_of(element):
+            idx = classifier(element)
+            if not 0 <= idx < n_buckets:
+                raise IndexError(f"Bucket index {idx} out of range")
+            return idx
+
+        if sinks is not None:
+            counts = [0] * n_buckets
+            for x in iterable:
+                idx = bucket_of(x)
+                sinks[idx](x)
+                counts[idx] += 1
+            yield from counts
+            return
+
+        if collector is None:
+            buckets = [[] for _ in range(n_buckets)]
+            for x in iterable:
+                buckets[bucket_of(x)].append(x)
+            yield from buckets
+            return
+
+        accumulate = collector.accumulator
+        states = [collector.supplier() for _ in range(n_buckets)]
+        for x in iterable:
+            idx = bucket_of(x)
+            states[idx] = accumulate(states[idx], x)
+        yield from map(collector.finisher, states)
+
     def subslices(self):
         """Returns all contiguous non-empty sub-slices"""
-        slices = it.starmap(slice, it.combinations(range(len(self.iterable) + 1), 2))
-        self.iterable = map(operator.getitem, it.repeat(self.iterable), slices)  # noqa
+        self._plan.add("subslices", func=self._subslices)
         return self
 
+    @staticmethod
+    def _subslices(iterable):
+        from pyrio.pipeline.sequence_view import SequenceView
+
+        if isinstance(iterable, SequenceView):
+            # slices of the internal view of a skipped/limited list or tuple would reach the user
+            iterable = iterable.materialize()
+        slices = it.starmap(slice, it.combinations(range(len(iterable) + 1), 2))
+        return map(operator.getitem, it.repeat(iterable), slices)  # noqa
+
     def find_indices(self, value, start=0, stop=None):
         """Returns indices where a value occurs in a sequence or iterable"""
-        self.iterable = self._find_indices(self.iterable, value, start, stop)
+        self._plan.add("find_indices", value, start, stop, func=self._find_indices)
         return self
 
     @staticmethod
@@ -210,3 +350,70 @@ class ItertoolsMixin:
         for i, element in enumerate(iterator, start):
             if element is value or element == value:
                 yield i
+
+
+# ### itertools integration ###
+# adapters calling an itertools function with the stream iterable and the (args, kwargs) given by the user;
+# built once per function when the module is imported
+def _iterable_first(it_func):
+    return lambda iterable, args, kwargs: it_func(iterable, *args, *kwargs.values())
+
+
+def _iterable_last(it_func):
+    return lambda iterable, args, kwargs: it_func(*args, *kwargs.values(), iterable)
+
+
+def _iterable_unpacked(it_func):
+    return lambda iterable, args, kwargs: it_func(*iterable, *args, **kwargs)
+
+
+def _from_signature(it_func):
+    import inspect
+
+    try:
+        parameters = list(inspect.signature(it_func).parameters)
+    except ValueError:
+        parameters = []
+    if parameters and parameters[0] in {"iterable", "data"}:
+        return lambda iterable, args, kwargs: it_func(iterable, *args, **kwargs)
+    # e.g. count - doesn't take an iterable
+    return lambda iterable, args, kwargs: it_func(*args, **kwargs)
+
+
+ADAPTER_FACTORIES = {
+    # handle functions that take no kwargs
+    "islice": _iterable_first,
+    "repeat": _iterable_first,
+    "tee": _iterable_first,
+    "chain": _iterable_first,
+    "dropwhile": _iterable_last,
+    "filterfalse": _iterable_last,
+    "starmap": _iterable_last,
+    "takewhile": _iterable_last,
+    # mixed
+    "product": _iterable_unpacked,
+    "zip_longest": _iterable_unpacked,
+}
+
+
+def _itertools_method(name):
+    it_func = getattr(it, name)
+    adapter = ADAPTER_FACTORIES.get(name, _from_signature)(it_func)
+
+    def method(self, *args, **kwargs):
+        self._plan.add(name, args, kwargs, func=adapter)
+        return self
+
+    method.__name__ = name
+    method.__qualname__ = f"{ItertoolsMixin.__name__}.{name}"
+    method.__doc__ = it_func.__doc__
+    return method
+
+
+for _name in dir(it):
+    if (
+        not _name.startswith("_")
+        and callable(getattr(it, _name))
+        and _name not in vars(ItertoolsMixin)
+    ):
+        setattr(ItertoolsMixin, _name, _itertools_method(_name))
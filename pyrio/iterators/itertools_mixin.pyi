@@ -1,5 +1,7 @@
 class ItertoolsMixin:
     iterable = None
+    _iterable = None
+    _plan = None
 
     def accumulate(self, func=None, initial=None): ...
     def batched(self, n, strict=False): ...
@@ -34,23 +36,50 @@ class ItertoolsMixin:
     def unique(self, key=None, reverse=False): ...
     def unique_just_seen(self, key=None): ...
     def unique_ever_seen(self, key=None): ...
-    def sliding_window(self, n): ...
+    def sliding_window(self, n, copy=True): ...
     def grouper(self, n, incomplete="fill", fill_value=None): ...
     def round_robin(self): ...
-    def partition(self, predicate): ...
+    def partition(self, predicate, collector=None, sinks=None): ...
+    def partition_by(self, classifier, n_buckets, collector=None, sinks=None): ...
     def subslices(self): ...
     def find_indices(self, value, start=0, stop=None): ...
 
     # ### ###
-    def _integrate(self, it_func, **kwargs): ...
-    def _grouper(self, n, incomplete="fill", fill_value=None): ...
     @staticmethod
-    def _unique(iterable, key=None): ...
+    def _tabulate(iterable, mapper, start=0): ...
+    @staticmethod
+    def _repeat_func(iterable, operation, times=None): ...
+    @staticmethod
+    def _ncycles(iterable, count=0): ...
+    @staticmethod
+    def _consume(iterable, n=None): ...
+    @classmethod
+    def _view(cls, iterable, start=0, stop=None, step=None): ...
+    @staticmethod
+    def _view_from_end(iterable, start, stop, step): ...
+    @classmethod
+    def _unique(cls, iterable, key=None, reverse=False): ...
+    @staticmethod
+    def _unique_just_seen(iterable, key=None): ...
     @staticmethod
     def _unique_ever_seen(iterable, key=None): ...
+    @classmethod
+    def _sliding_window(cls, iterable, n, copy=True): ...
     @staticmethod
-    def _sliding_window(iterable, n): ...
+    def _sliding_window_copy(iterable, n): ...
+    @staticmethod
+    def _sliding_window_view(iterable, n): ...
+    @staticmethod
+    def _grouper(iterable, n, incomplete="fill", fill_value=None): ...
     @staticmethod
     def _round_robin(iterable): ...
+    @classmethod
+    def _partition(cls, iterable, predicate, collector=None, sinks=None): ...
+    @staticmethod
+    def _validate_buckets(n_buckets, collector, sinks): ...
+    @staticmethod
+    def _partition_by(iterable, classifier, n_buckets, collector=None, sinks=None): ...
+    @staticmethod
+    def _subslices(iterable): ...
     @staticmethod
     def _find_indices(iterable, value, start=0, stop=None): ...
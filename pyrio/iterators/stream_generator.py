@@ -1,7 +1,17 @@
 from collections.abc import Iterable
+from functools import lru_cache
 
 from pyrio.decorators import map_dict_items
 
+# element-wise stages that can be fused into a single loop
+FUSED_STAGES = {
+    "map": ("x = f{idx}(x)",),
+    "filter": ("if not f{idx}(x):", "    continue"),
+    "filter_map": ("if x is None:", "    continue", "x = f{idx}(x)"),
+    "filter_map_falsy": ("if not x:", "    continue", "x = f{idx}(x)"),
+    "peek": ("f{idx}(x)",),
+}
+
 
 class StreamGenerator:
     """Helper class wrapping generator-based operations for lazy evaluation"""
@@ -13,6 +23,11 @@ class StreamGenerator:
         for iterable in streams:
             yield from iterable
 
+    @classmethod
+    def prepend(cls, iterable, other):
+        """Yields the elements of 'other' followed by those of iterable"""
+        return cls.concat(other, iterable)
+
     @staticmethod
     def filter(iterable, predicate):
         """Yields elements that satisfy the predicate"""
@@ -55,6 +70,76 @@ class StreamGenerator:
             operation(i)
             yield i
 
+    @staticmethod
+    def batch(iterable, size):
+        """Yields lists of up to 'size' consecutive elements"""
+        import itertools
+
+        for chunk in itertools.batched(iterable, size):
+            yield list(chunk)
+
+    @classmethod
+    def map_batches(cls, iterable, mapper, size):
+        """Applies mapper to lists of up to 'size' elements and flattens the returned results"""
+        for chunk in cls.batch(iterable, size):
+            yield from mapper(chunk)
+
+    @staticmethod
+    def window_aggregate(iterable, size, step=1, agg="sum"):
+        """
+        Yields the aggregation of each full window of 'size' elements, starting a new window every 'step' elements.
+        'sum' and 'mean' keep a running (Neumaier-compensated) total, 'min' and 'max' a monotonic deque -
+        O(1) amortized per element;
+        a custom function is called with a tuple of the window elements
+        """
+        import collections
+        import operator
+
+        iterator = enumerate(iterable)
+        # index of the last element of the first window; next ones end 'step' elements apart
+        window_end = size - 1
+        match agg:
+            case "sum" | "mean":
+                window = collections.deque()
+                # the compensation keeps the low-order bits that float additions and removals cancel out
+                total = compensation = 0
+                for idx, x in iterator:
+                    window.append(x)
+                    total, compensation = _neumaier_add(total, compensation, x)
+                    if len(window) > size:
+                        total, compensation = _neumaier_add(total, compensation, -window.popleft())
+                    if idx == window_end:
+                        window_end += step
+                        yield (
+                            (total + compensation) / size if agg == "mean" else total + compensation
+                        )
+            case "min" | "max":
+                # candidates for the extreme of the current window - values are monotonic from the front
+                window = collections.deque()
+                dominates = operator.le if agg == "min" else operator.ge
+                for idx, x in iterator:
+                    while window and dominates(x, window[-1][1]):
+                        window.pop()
+                    window.append((idx, x))
+                    if window[0][0] <= idx - size:
+                        window.popleft()
+                    if idx == window_end:
+                        window_end += step
+                        yield window[0][1]
+            case _:
+                window = collections.deque(maxlen=size)
+                for idx, x in iterator:
+                    window.append(x)
+                    if idx == window_end:
+                        window_end += step
+                        yield agg(tuple(window))
+
+    @staticmethod
+    def fuse(iterable, stages):
+        """Applies a chain of element-wise (kind, function) stages in a single loop"""
+        fused = _compile_fused(tuple(kind for kind, _ in stages))
+        return fused(iterable, *(func for _, func in stages))
+
     @staticmethod
     def iterate(seed, operation, condition=None):
         """Generates sequence by repeatedly applying operation to seed"""
@@ -85,6 +170,20 @@ class StreamGenerator:
                 elements.add(i)
                 yield i
 
+    @staticmethod
+    def distinct_approximate(iterable, error_rate=0.01, capacity=1_000_000):
+        """
+        Yields unique elements preserving first occurrence order, tracking the seen ones in a Bloom filter.
+        Duplicates are never yielded; a new element is dropped with probability below 'error_rate'
+        as long as there are at most 'capacity' distinct elements
+        """
+        from pyrio.utils import BloomFilter
+
+        seen = BloomFilter(capacity, error_rate)
+        for i in iterable:
+            if seen.add(i):
+                yield i
+
     @staticmethod
     def skip(iterable, count):
         """Skips first n elements and yields the rest"""
@@ -131,14 +230,271 @@ class StreamGenerator:
         for x in iterator:
             yield x
 
-    @staticmethod
-    def sort(iterable, comparator=None, reverse=False):
-        """Yields elements in sorted order"""
-        for i in sorted(iterable, key=comparator, reverse=reverse):
+    @classmethod
+    def sort(cls, iterable, comparator=None, reverse=False, limit=None, memory_limit=None):
+        """
+        Yields elements in sorted order.
+        If limit is given only the first n of them are kept in a bounded heap - O(n log k) time, O(k) memory
+        (the result is equivalent to sorted()[:limit], including the order of equal elements).
+        If memory_limit is given (and exceeded) the elements are sorted externally - see 'external_sort'
+        """
+        if memory_limit is not None and (limit is None or limit > memory_limit):
+            result = cls.external_sort(iterable, comparator, reverse, memory_limit)
+            if limit is not None:
+                import itertools
+
+                result = itertools.islice(result, limit)
+        elif limit is None:
+            result = sorted(iterable, key=comparator, reverse=reverse)
+        else:
+            import heapq
+
+            select = heapq.nlargest if reverse else heapq.nsmallest
+            result = select(limit, iterable, key=comparator)
+        for i in result:
             yield i
 
+    @staticmethod
+    def external_sort(iterable, comparator=None, reverse=False, memory_limit=100_000):
+        """
+        Sorts runs of at most 'memory_limit' elements, spills them to temporary files (pickled in batches)
+        and merges them lazily with heapq.merge. Stable, like sorted(); the files are removed once the merge ends
+        """
+        import heapq
+        import itertools
+
+        iterator = iter(iterable)
+        run = sorted(itertools.islice(iterator, memory_limit), key=comparator, reverse=reverse)
+        if len(run) < memory_limit:
+            # everything fits in memory
+            yield from run
+            return
+
+        runs = []
+        try:
+            while run:
+                runs.append(_spill(run))
+                # release the spilled run before reading the next one
+                run = None
+                run = sorted(
+                    itertools.islice(iterator, memory_limit), key=comparator, reverse=reverse
+                )
+            # heapq.merge yields equal elements in the order of the runs - which preserves stability
+            yield from heapq.merge(*map(_read_spilled, runs), key=comparator, reverse=reverse)
+        finally:
+            for file in runs:
+                file.close()
+
+    @staticmethod
+    def spill_grouped(pairs, initial, fold, memory_limit=100_000, counts_values=True):
+        """
+        Folds (key, value) pairs into one state per key - 'initial(value)' for the first value of a key,
+        'fold(key, state, value)' for the next ones - and yields (key, state) in first-seen key order.
+        Once the hash table holds more than 'memory_limit' entries (every value, or only every key
+        if not 'counts_values'), the table and the rest of the pairs are hash-partitioned to temporary files
+        and each bucket is folded on its own. The output is the same as the in-memory one
+        """
+        import heapq
+        import operator
+
+        table = {}
+        held = 0
+        iterator = enumerate(pairs)
+        for idx, (key, value) in iterator:
+            if (entry := table.get(key)) is None:
+                table[key] = [idx, initial(value)]
+                held += 1
+            else:
+                entry[1] = fold(key, entry[1], value)
+                held += counts_values
+            if held > memory_limit:
+                break
+        else:
+            # everything fits in memory
+            for key, (_, state) in table.items():
+                yield key, state
+            return
+
+        buckets = _SpillBuckets(SPILL_PARTITIONS)
+        results = []
+        try:
+            # records carry the index of their first occurrence; folded states are flagged as such
+            for key, (idx, state) in table.items():
+                buckets.write(key, (idx, key, state, True))
+            table = None
+            for idx, (key, value) in iterator:
+                buckets.write(key, (idx, key, value, False))
+
+            for records in buckets.drain():
+                table = {}
+                for idx, key, value, is_state in records:
+                    if (entry := table.get(key)) is None:
+                        table[key] = [idx, value if is_state else initial(value)]
+                    else:
+                        entry[1] = fold(key, entry[1], value)
+                # keys enter a bucket in first-seen order - so its table is already sorted by index
+                results.append(_spill([(idx, key, state) for key, (idx, state) in table.items()]))
+                table = None
+            for _, key, state in heapq.merge(
+                *map(_read_spilled, results), key=operator.itemgetter(0)
+            ):
+                yield key, state
+        finally:
+            buckets.close()
+            for file in results:
+                file.close()
+
+    @staticmethod
+    def sample(iterable, count, seed=None):
+        """
+        Yields a uniform random sample of 'count' elements (in no particular order) collected in a single pass.
+        Uses reservoir sampling with Algorithm L - skips over the elements that won't enter the reservoir
+        """
+        import itertools
+        import math
+        import random
+
+        rng = random.Random(seed)
+        iterator = iter(iterable)
+        reservoir = list(itertools.islice(iterator, count))
+        if count and len(reservoir) == count:
+            weight = math.exp(math.log(_random_open(rng)) / count)
+            while True:
+                skip = math.floor(math.log(_random_open(rng)) / math.log1p(-weight))
+                element = next(itertools.islice(iterator, skip, None), _MISSING)
+                if element is _MISSING:
+                    break
+                reservoir[rng.randrange(count)] = element
+                weight *= math.exp(math.log(_random_open(rng)) / count)
+        yield from reservoir
+
+    @staticmethod
+    def sample_fraction(iterable, fraction, seed=None):
+        """Yields each element with probability 'fraction' (Bernoulli sampling), preserving the order"""
+        import itertools
+        import math
+        import random
+
+        if fraction >= 1:
+            yield from iterable
+            return
+        if fraction <= 0:
+            return
+
+        rng = random.Random(seed)
+        log_rejection = math.log1p(-fraction)
+        iterator = iter(iterable)
+        while True:
+            # the gap to the next sampled element is geometrically distributed
+            skip = math.floor(math.log(_random_open(rng)) / log_rejection)
+            element = next(itertools.islice(iterator, skip, None), _MISSING)
+            if element is _MISSING:
+                return
+            yield element
+
     @staticmethod
     def enumerate(iterable, start=0):
         """Yields index-element pairs starting from given index"""
         for i, item in enumerate(iterable, start):
             yield i, item
+
+
+_MISSING = object()
+# number of elements pickled together in a spilled run
+SPILL_BATCH_SIZE = 1_024
+# number of on-disk buckets used by spill_grouped
+SPILL_PARTITIONS = 64
+
+
+def _spill(run):
+    import pickle
+    import tempfile
+
+    file = tempfile.TemporaryFile()
+    for idx in range(0, len(run), SPILL_BATCH_SIZE):
+        pickle.dump(run[idx : idx + SPILL_BATCH_SIZE], file, protocol=pickle.HIGHEST_PROTOCOL)
+    file.seek(0)
+    return file
+
+
+def _read_spilled(file):
+    import pickle
+
+    while True:
+        try:
+            yield from pickle.load(file)
+        except EOFError:
+            return
+
+
+class _SpillBuckets:
+    """Temporary files receiving records partitioned by the hash of their key, pickled in batches"""
+
+    def __init__(self, count):
+        import tempfile
+
+        self._files = [tempfile.TemporaryFile() for _ in range(count)]
+        self._buffers = [[] for _ in range(count)]
+
+    def write(self, key, record):
+        idx = hash(key) % len(self._files)
+        buffer = self._buffers[idx]
+        buffer.append(record)
+        if len(buffer) == SPILL_BATCH_SIZE:
+            self._flush(idx)
+
+    def _flush(self, idx):
+        import pickle
+
+        pickle.dump(self._buffers[idx], self._files[idx], protocol=pickle.HIGHEST_PROTOCOL)
+        self._buffers[idx] = []
+
+    def drain(self):
+        """Yields the records of each bucket in turn, closing its file once read"""
+        for idx, file in enumerate(self._files):
+            if self._buffers[idx]:
+                self._flush(idx)
+            file.seek(0)
+            yield _read_spilled(file)
+            file.close()
+
+    def close(self):
+        for file in self._files:
+            file.close()
+
+
+def _neumaier_add(total, compensation, x):
+    # https://en.wikipedia.org/wiki/Kahan_summation_algorithm#Further_enhancements
+    result = total + x
+    if abs(total) >= abs(x):
+        compensation += (total - result) + x
+    else:
+        compensation += (x - result) + total
+    return result, compensation
+
+
+def _random_open(rng):
+    # uniform value in the open interval (0, 1)
+    while (value := rng.random()) == 0.0:
+        pass
+    return value
+
+
+@lru_cache(maxsize=256)
+def _compile_fused(kinds):
+    # generates one generator function per distinct chain of stage kinds, e.g. ('map', 'filter') ->
+    # def _fused(iterable, f0, f1):
+    #     for x in iterable:
+    #         x = f0(x)
+    #         if not f1(x):
+    #             continue
+    #         yield x
+    params = "".join(f", f{idx}" for idx in range(len(kinds)))
+    lines = [f"def _fused(iterable{params}):", "    for x in iterable:"]
+    for idx, kind in enumerate(kinds):
+        lines.extend(f"        {line.format(idx=idx)}" for line in FUSED_STAGES[kind])
+    lines.append("        yield x")
+
+    namespace = {}
+    exec("\n".join(lines), namespace)  # noqa: S102
+    return namespace["_fused"]
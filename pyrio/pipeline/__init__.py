@@ -0,0 +1,14 @@
+from .optimizer import optimize as optimize
+from .plan import Plan as Plan, Stage as Stage
+from .explanation import (
+    Explanation as Explanation,
+    STREAMING as STREAMING,
+    BUFFERING as BUFFERING,
+    MATERIALIZING as MATERIALIZING,
+)
+from .size_hint import (
+    SizeHint as SizeHint,
+    EXACT as EXACT,
+    AT_MOST as AT_MOST,
+    UNKNOWN as UNKNOWN,
+)
@@ -0,0 +1,134 @@
+from pyrio.pipeline.optimizer import Stage
+
+STREAMING = "streaming"
+BUFFERING = "buffering"
+MATERIALIZING = "materializing"
+
+# stages holding a bounded number of elements in memory
+BUFFERING_STAGES = {
+    "tail",
+    "sliding_window",
+    "window_aggregate",
+    "grouper",
+    "batched",
+    "batch",
+    "map_batches",
+    "map_concurrent",
+    "sample",
+}
+# stages holding (up to) the whole input in memory
+MATERIALIZING_STAGES = {
+    "sort",
+    "distinct",
+    "unique",
+    "unique_ever_seen",
+    "partition",
+    "partition_by",
+    "ncycles",
+    "subslices",
+    "cycle",
+    "tee",
+    "product",
+    "zip_longest",
+    "permutations",
+    "combinations",
+    "combinations_with_replacement",
+}
+
+# terminal operations that don't depend on the order of the elements
+UNORDERED_TERMINALS = {
+    "len",
+    "sum",
+    "average",
+    "summary_statistics",
+    "count_distinct",
+    "find_any",
+    "to_set",
+    "any_match",
+    "all_match",
+    "none_match",
+}
+BUFFERING_TERMINALS = {"take_last", "top_k", "aggregate_by", "fork"}
+MATERIALIZING_TERMINALS = {
+    "count_distinct",
+    "collect",
+    "to_list",
+    "to_tuple",
+    "to_set",
+    "to_dict",
+    "to_string",
+    "to_numeric",
+    "group_by",
+    "save",
+}
+
+
+def stage_mode(stage):
+    """Returns whether the stage is streaming, buffering or materializing its input"""
+    match stage:
+        case Stage(name="sort", args=(_, _, limit, memory_limit)) if limit or memory_limit:
+            return BUFFERING
+        case Stage(name="partition" | "partition_by", args=(*_, sinks)) if sinks is not None:
+            # the elements are pushed to the sinks - only the counts are kept
+            return STREAMING
+        case Stage(name=name) if name in BUFFERING_STAGES:
+            return BUFFERING
+        case Stage(name=name) if name in MATERIALIZING_STAGES:
+            return MATERIALIZING
+        case _:
+            return STREAMING
+
+
+def terminal_mode(terminal):
+    """Returns whether the terminal operation is streaming, buffering or materializing its input"""
+    if terminal in MATERIALIZING_TERMINALS:
+        return MATERIALIZING
+    if terminal in BUFFERING_TERMINALS:
+        return BUFFERING
+    return STREAMING
+
+
+class Explanation:
+    """Description of the optimized plan of a stream: its stages, their evaluation mode and applied optimizations"""
+
+    def __init__(self, source, stages, terminal=None, optimizations=()):
+        self._source = source
+        self._stages = tuple(stages)
+        self._terminal = terminal
+        self._optimizations = tuple(optimizations)
+
+    @property
+    def source(self):
+        return self._source
+
+    @property
+    def stages(self):
+        """Tuple of (stage, mode) pairs in execution order"""
+        return self._stages
+
+    @property
+    def terminal(self):
+        """(terminal, mode) pair or None"""
+        return self._terminal
+
+    @property
+    def optimizations(self):
+        return self._optimizations
+
+    @property
+    def materializing(self):
+        """Names of the stages (and terminal operation) that hold the whole input in memory"""
+        steps = self._stages + ((self._terminal,) if self._terminal else ())
+        return tuple(name for name, mode in steps if mode == MATERIALIZING)
+
+    def __str__(self):
+        lines = [f"source: {self._source}"]
+        lines.extend(f"  {name:<30} {mode}" for name, mode in self._stages)
+        if self._terminal:
+            name, mode = self._terminal
+            lines.append(f"terminal: {name:<22} {mode}")
+        lines.append(f"optimizations: {', '.join(self._optimizations) or '-'}")
+        return "\n".join(lines)
+
+    def __repr__(self):
+        return str(self)
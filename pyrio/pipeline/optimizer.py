@@ -0,0 +1,88 @@
+from collections import namedtuple
+
+# 'func' is given for stages not implemented by the StreamGenerator method with the same name
+Stage = namedtuple("Stage", ["name", "args", "func"], defaults=[None])
+
+# element-wise stages without side effects which don't depend on the order of the elements
+PURE_STAGES = {"map", "filter", "filter_map"}
+
+
+def optimize(stages, ordered=True):
+    """
+    Rewrites the logical plan by applying the peephole rules on adjacent stages until none of them matches.
+    If 'ordered' is False (the terminal operation ignores the order of the elements) trailing sorts are dropped.
+    Returns the optimized stages and the names of the applied rules
+    """
+    stages = list(stages)
+    applied = []
+    if not ordered:
+        stages = drop_unordered_sort(stages, applied)
+
+    changed = True
+    while changed:
+        changed = False
+        for idx in range(len(stages) - 1):
+            for rule in RULES:
+                replacement = rule(stages[idx], stages[idx + 1])
+                if replacement is not None:
+                    stages[idx : idx + 2] = replacement
+                    applied.append(rule.__name__)
+                    changed = True
+                    break
+            if changed:
+                break
+    return stages, applied
+
+
+def drop_unordered_sort(stages, applied):
+    """sort().map(f).to_set() -> map(f).to_set()"""
+    result = []
+    trailing = True
+    for stage in reversed(stages):
+        if trailing and stage.name == "sort" and stage.args[2] is None:
+            applied.append(drop_unordered_sort.__name__)
+            continue
+        trailing = trailing and (stage.name in PURE_STAGES or stage.name == "sort")
+        result.append(stage)
+    return result[::-1]
+
+
+# ### rules ###
+def merge_skips(first, second):
+    """skip(a).skip(b) -> skip(a + b)"""
+    if first.name == second.name == "skip":
+        return [Stage("skip", (first.args[0] + second.args[0],))]
+    return None
+
+
+def merge_limits(first, second):
+    """limit(a).limit(b) -> limit(min(a, b))"""
+    if first.name == second.name == "limit":
+        return [Stage("limit", (min(first.args[0], second.args[0]),))]
+    return None
+
+
+def swap_limit_skip(first, second):
+    """limit(a).skip(b) -> skip(b).limit(a - b)"""
+    if first.name == "limit" and second.name == "skip":
+        return [second, Stage("limit", (max(first.args[0] - second.args[0], 0),))]
+    return None
+
+
+def push_limit_before_map(first, second):
+    """map(f).limit(n) -> limit(n).map(f)"""
+    if first.name == "map" and second.name == "limit":
+        return [second, first]
+    return None
+
+
+def collapse_sort_limit(first, second):
+    """sort(key).limit(n) -> sort(key, limit=n)"""
+    if first.name == "sort" and second.name == "limit":
+        comparator, reverse, limit, memory_limit = first.args
+        count = second.args[0] if limit is None else min(limit, second.args[0])
+        return [Stage("sort", (comparator, reverse, count, memory_limit))]
+    return None
+
+
+RULES = (merge_skips, merge_limits, swap_limit_skip, push_limit_before_map, collapse_sort_limit)
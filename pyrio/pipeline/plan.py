@@ -0,0 +1,155 @@
+from pyrio.iterators import ConcurrentGenerator, StreamGenerator
+from pyrio.iterators.concurrent_generator import PARALLEL_STAGES
+from pyrio.iterators.stream_generator import FUSED_STAGES
+from pyrio.pipeline.explanation import (
+    UNORDERED_TERMINALS,
+    BUFFERING,
+    STREAMING,
+    Explanation,
+    stage_mode,
+    terminal_mode,
+)
+from pyrio.pipeline.optimizer import Stage, optimize
+from pyrio.pipeline.sequence_view import INDEXED_SOURCES, index_stage
+from pyrio.pipeline.size_hint import propagate, source_size_hint
+
+
+class Plan:
+    """Logical plan of the stages recorded by a stream; optimized and compiled lazily by the terminal operation"""
+
+    def __init__(self):
+        self.stages = []
+        self.optimizations = []
+        # process pool options (workers, ordered, chunk_size) for element-wise stages, if set
+        self.parallel = None
+
+    def __bool__(self):
+        return bool(self.stages)
+
+    def add(self, name, *args, func=None):
+        """
+        Records a stage implemented by the StreamGenerator method with the same name
+        or by the given 'func' receiving the iterable followed by the stage args
+        """
+        self.stages.append(Stage(name, args, func))
+
+    def compile(self, iterable, terminal=None):
+        """
+        Optimizes the recorded stages and chains them onto the given iterable.
+        Leading skip, limit, tail, view (and sort of a range) over a list, tuple or range are applied by slicing.
+        Consecutive element-wise stages are fused into a single loop (or run in a process pool if parallel)
+        """
+        stages, applied = optimize(self.stages, terminal not in UNORDERED_TERMINALS)
+        self.stages = []
+        iterable, stages = self._index_source(iterable, stages, applied)
+        for kind, group in self._segments(stages):
+            match kind:
+                case "fused":
+                    iterable = StreamGenerator.fuse(iterable, [self._fused_kind(s) for s in group])
+                case "parallel":
+                    parallel_stages = [(s.name, s.args) for s in group]
+                    iterable = ConcurrentGenerator.process(
+                        iterable, parallel_stages, *self.parallel
+                    )
+                case _:
+                    stage = group[0]
+                    iterable = (stage.func or getattr(StreamGenerator, stage.name))(
+                        iterable, *stage.args
+                    )
+            if optimization := self._group_optimization(kind, group):
+                applied.append(optimization)
+        self.optimizations.extend(applied)
+        return iterable
+
+    def explain(self, iterable, terminal=None):
+        """Describes the optimized plan for the given source without executing it"""
+        stages, applied = optimize(self.stages, terminal not in UNORDERED_TERMINALS)
+        _, stages = self._index_source(iterable, stages, applied)
+        steps = []
+        for kind, group in self._segments(stages):
+            match kind:
+                case "fused":
+                    steps.append((self._describe_group("fused", group), STREAMING))
+                case "parallel":
+                    steps.append((self._describe_group("parallel", group), BUFFERING))
+                case _:
+                    steps.append((self._describe(group[0]), stage_mode(group[0])))
+            if optimization := self._group_optimization(kind, group):
+                applied.append(optimization)
+        return Explanation(
+            source=type(iterable).__name__,
+            stages=steps,
+            terminal=(terminal, terminal_mode(terminal)) if terminal else None,
+            optimizations=self.optimizations + applied,
+        )
+
+    def size_hint(self, iterable):
+        """Returns the size hint of the stream obtained by applying the recorded stages to the given source"""
+        hint = source_size_hint(iterable)
+        for stage in self.stages:
+            hint = propagate(hint, stage)
+        return hint
+
+    @staticmethod
+    def _index_source(iterable, stages, applied):
+        # leading stages over a list, tuple or range are resolved by index arithmetic into a lazy view
+        if not isinstance(iterable, INDEXED_SOURCES):
+            return iterable, stages
+        for idx, stage in enumerate(stages):
+            if (sliced := index_stage(iterable, stage)) is None:
+                return iterable, stages[idx:]
+            iterable = sliced
+            applied.append("index_source")
+        return iterable, []
+
+    def _segments(self, stages):
+        # groups consecutive element-wise stages to be fused (or executed in parallel) as a whole
+        kind, names = ("parallel", PARALLEL_STAGES) if self.parallel else ("fused", FUSED_STAGES)
+        group = []
+        for stage in stages:
+            if stage.name in names and stage.func is None:
+                group.append(stage)
+                continue
+            if group:
+                yield kind, group
+                group = []
+            yield "stage", [stage]
+        if group:
+            yield kind, group
+
+    @staticmethod
+    def _group_optimization(kind, group):
+        match kind:
+            case "fused" if len(group) > 1:
+                return "fuse_stages"
+            case "parallel":
+                return "parallelize_stages"
+            case _:
+                return None
+
+    @staticmethod
+    def _fused_kind(stage):
+        match stage:
+            case Stage(name="filter_map", args=(mapper, True)):
+                return "filter_map_falsy", mapper
+            case Stage(name=name, args=(func, *_)):
+                return name, func
+
+    @staticmethod
+    def _describe(stage):
+        match stage:
+            case Stage(name="sort", args=(_, reverse, limit, memory_limit)):
+                options = [f"reverse={reverse}"] if reverse else []
+                options += [f"limit={limit}"] if limit is not None else []
+                options += [f"memory_limit={memory_limit}"] if memory_limit is not None else []
+                return f"sort({', '.join(options)})"
+            case Stage(name="skip" | "limit" | "tail" | "enumerate", args=(count,)):
+                return f"{stage.name}({count})"
+            case _:
+                return stage.name
+
+    @classmethod
+    def _describe_group(cls, kind, group):
+        if kind == "fused" and len(group) == 1:
+            return cls._describe(group[0])
+        return f"{kind}({', '.join(s.name for s in group)})"
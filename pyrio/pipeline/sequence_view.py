@@ -0,0 +1,94 @@
+import collections
+from collections.abc import Sequence
+
+from pyrio.pipeline.optimizer import Stage
+
+
+class SequenceView(Sequence):
+    """Lazy view of selected indices of a list or tuple - slicing it doesn't copy or iterate the elements"""
+
+    __slots__ = ("_sequence", "_indices")
+
+    def __init__(self, sequence, indices=None):
+        self._sequence = sequence
+        self._indices = range(len(sequence)) if indices is None else indices
+
+    def __len__(self):
+        return len(self._indices)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return SequenceView(self._sequence, self._indices[key])
+        return self._sequence[self._indices[key]]
+
+    def __iter__(self):
+        return map(self._sequence.__getitem__, self._indices)
+
+    def __reversed__(self):
+        return iter(self[::-1])
+
+    def __repr__(self):
+        return f"SequenceView({list(self)!r})"
+
+    def materialize(self):
+        """Copies the selected elements into a sequence of the viewed type (list or tuple)"""
+        return type(self._sequence)(self)
+
+
+class WindowView(collections.deque):
+    """
+    Read-only window over a circular buffer - yielded by 'sliding_window(n, copy=False)'.
+    The same view is shifted in place on every step; copy it (e.g. with tuple()) to keep a window.
+    Indexing and iteration are those of a deque
+    """
+
+    __slots__ = ()
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError("'WindowView' object is read-only")
+
+    append = appendleft = extend = extendleft = insert = _read_only
+    pop = popleft = remove = rotate = reverse = clear = _read_only
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _read_only
+
+    def __eq__(self, other):
+        if not isinstance(other, Sequence) or isinstance(other, str):
+            return NotImplemented
+        return len(self) == len(other) and all(x == y for x, y in zip(self, other))
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"WindowView({list(self)!r})"
+
+
+# sources supporting random access
+INDEXED_SOURCES = (list, tuple, range, SequenceView)
+
+
+def index_stage(sequence, stage):
+    """
+    Applies the stage to a list, tuple or range by index arithmetic, returning a range or a lazy SequenceView.
+    Returns None if the stage needs to iterate the elements
+    """
+    match stage:
+        case Stage(name="skip", args=(count,)):
+            key = slice(count, None)
+        case Stage(name="limit", args=(count,)):
+            key = slice(None, count)
+        case Stage(name="tail", args=(count,)):
+            key = slice(max(len(sequence) - count, 0), None)
+        case Stage(name="view", args=(start, stop, step)):
+            key = slice(start, stop, step)
+        case Stage(name="consume", args=(count,)):
+            key = slice(len(sequence) if count is None else count, None)
+        case Stage(name="sort", args=(None, reverse, limit, _)) if isinstance(sequence, range):
+            # a range is already sorted in the direction of its step
+            if (sequence.step < 0) != reverse:
+                sequence = sequence[::-1]
+            key = slice(None, limit)
+        case _:
+            return None
+    if isinstance(sequence, (range, SequenceView)):
+        return sequence[key]
+    return SequenceView(sequence)[key]
@@ -0,0 +1,75 @@
+from collections import namedtuple
+from collections.abc import Sized
+
+EXACT = "exact"
+AT_MOST = "at_most"
+UNKNOWN = "unknown"
+
+# number of elements a stream will yield: exact, an upper bound or unknown (size is None)
+SizeHint = namedtuple("SizeHint", ["kind", "size"], defaults=[None])
+
+# stages yielding exactly one element per input element
+SIZE_PRESERVING_STAGES = {"map", "peek", "enumerate", "map_concurrent"}
+# stages yielding at most one element per input element
+SIZE_REDUCING_STAGES = {
+    "filter",
+    "filter_map",
+    "distinct",
+    "distinct_approximate",
+    "take_while",
+    "drop_while",
+    "unique",
+    "unique_just_seen",
+    "unique_ever_seen",
+    "sample_fraction",
+}
+
+
+def source_size_hint(iterable):
+    """Returns the size hint of a stream source - exact for Sized collections, unknown otherwise"""
+    if isinstance(iterable, Sized):
+        return SizeHint(EXACT, len(iterable))
+    return SizeHint(UNKNOWN)
+
+
+def propagate(hint, stage):
+    """Returns the size hint of the output of the stage given the hint of its input"""
+    kind, size = hint
+    match stage.name, stage.args:
+        case name, _ if name in SIZE_PRESERVING_STAGES:
+            return hint
+        case "sort", (_, _, limit, _):
+            return hint if limit is None else _bounded(hint, limit)
+        case name, _ if name in SIZE_REDUCING_STAGES:
+            return SizeHint(AT_MOST, size) if kind != UNKNOWN else hint
+        case "skip" | "consume", (count,) if kind != UNKNOWN:
+            return SizeHint(kind, 0 if count is None else max(size - count, 0))
+        case "limit" | "tail", (count,):
+            return _bounded(hint, count)
+        case "sample", (count, _):
+            return _bounded(hint, count)
+        case "view", (start, stop, step) if kind != UNKNOWN:
+            return SizeHint(kind, len(range(size)[start:stop:step]))
+        case "view", (start, stop, step) if stop is not None and min(start, stop) >= 0:
+            return SizeHint(AT_MOST, len(range(stop)[start:stop:step]))
+        case "batch", (count,) if kind != UNKNOWN:
+            return SizeHint(kind, -(-size // count))
+        case "sliding_window", (count, _) if kind != UNKNOWN:
+            return SizeHint(kind, max(size - count + 1, 0) if count else 0)
+        case "window_aggregate", (count, step, _) if kind != UNKNOWN:
+            return SizeHint(kind, (size - count) // step + 1 if size >= count else 0)
+        case "partition", _:
+            return SizeHint(EXACT, 2)
+        case "partition_by", (_, n_buckets, *_):
+            return SizeHint(EXACT, n_buckets)
+        case "concat" | "prepend", others if kind != UNKNOWN:
+            if all(isinstance(other, Sized) for other in others):
+                return SizeHint(kind, size + sum(len(other) for other in others))
+    return SizeHint(UNKNOWN)
+
+
+def _bounded(hint, count):
+    kind, size = hint
+    if kind == UNKNOWN:
+        return SizeHint(AT_MOST, count)
+    return SizeHint(kind, min(size, count))
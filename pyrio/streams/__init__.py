@@ -1,3 +1,4 @@
 from .base_stream import BaseStream as BaseStream
 from .stream import Stream as Stream
 from .file_stream import FileStream as FileStream
+from .async_stream import AsyncStream as AsyncStream
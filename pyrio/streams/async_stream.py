@@ -0,0 +1,258 @@
+from collections.abc import Mapping
+
+from pyrio.decorators import handle_consumed, pre_call
+from pyrio.exceptions import IllegalStateError, NoneTypeError, UnsupportedTypeError
+from pyrio.iterators import AsyncStreamGenerator
+from pyrio.iterators.async_stream_generator import resolve
+from pyrio.utils import DictItem, Optional
+
+
+@pre_call(handle_consumed)
+class AsyncStream:
+    """
+    Asyncio-native counterpart of Stream over sync or async iterables.
+    Functions passed to the operations may be regular or coroutine functions; terminal operations are awaitable
+    """
+
+    def __init__(self, iterable):
+        if iterable is None:
+            raise NoneTypeError("Cannot create AsyncStream from None")
+        if isinstance(iterable, Mapping):
+            iterable = tuple(DictItem(k, v) for k, v in iterable.items())
+        self._iterable = AsyncStreamGenerator.from_iterable(iterable)
+        self._is_consumed = False
+        self._on_close_handler = None
+
+    def __aiter__(self):
+        return aiter(self._iterable)
+
+    @classmethod
+    def of(cls, *iterable):
+        """Creates AsyncStream from args"""
+        return cls(iterable)
+
+    @classmethod
+    def of_nullable(cls, iterable):
+        """Creates AsyncStream from args if iterable is not None; otherwise returns empty AsyncStream"""
+        if iterable is None:
+            return cls.empty()
+        return cls(iterable)
+
+    @classmethod
+    def empty(cls):
+        """Creates empty AsyncStream"""
+        return cls([])
+
+    # ### intermediate operations ###
+    def concat(self, *streams):
+        """Concatenates several (async) streams/iterables to the current one"""
+        self._iterable = AsyncStreamGenerator.concat(self._iterable, *streams)
+        return self
+
+    def filter(self, predicate):
+        """Filters values in stream based on given (async) predicate function"""
+        self._iterable = AsyncStreamGenerator.filter(self._iterable, predicate)
+        return self
+
+    def map(self, mapper, *, concurrency=1, ordered=True):
+        """
+        Returns a stream consisting of the results of applying the given (async) function to the elements.
+        Up to 'concurrency' calls are awaited at the same time;
+        if 'ordered' is False the results are yielded as soon as they are ready
+        """
+        if concurrency < 1:
+            raise ValueError("Concurrency must be positive")
+        if concurrency == 1:
+            self._iterable = AsyncStreamGenerator.map(self._iterable, mapper)
+        else:
+            self._iterable = AsyncStreamGenerator.map_concurrent(
+                self._iterable, mapper, concurrency, ordered
+            )
+        return self
+
+    def filter_map(self, mapper, *, discard_falsy=False):
+        """Filters out all None or falsy values and applies (async) mapper function to the elements"""
+        self._iterable = AsyncStreamGenerator.filter_map(self._iterable, mapper, discard_falsy)
+        return self
+
+    def flat_map(self, mapper):
+        """Maps each element of the stream and yields the elements of the produced (async) iterables"""
+        self._iterable = AsyncStreamGenerator.flat_map(self._iterable, mapper)
+        return self
+
+    def peek(self, operation):
+        """Performs the provided (async) operation on each element of the stream without consuming it"""
+        self._iterable = AsyncStreamGenerator.peek(self._iterable, operation)
+        return self
+
+    def distinct(self):
+        """Returns a stream with the distinct elements of the current one"""
+        self._iterable = AsyncStreamGenerator.distinct(self._iterable)
+        return self
+
+    def skip(self, count):
+        """Discards the first n elements of the stream and returns a new stream with the remaining ones"""
+        if count < 0:
+            raise ValueError("Skip count cannot be negative")
+        self._iterable = AsyncStreamGenerator.skip(self._iterable, count)
+        return self
+
+    def limit(self, count):
+        """Returns a stream with the first n elements, or fewer if the underlying iterator ends sooner"""
+        if count < 0:
+            raise ValueError("Limit count cannot be negative")
+        self._iterable = AsyncStreamGenerator.limit(self._iterable, count)
+        return self
+
+    def head(self, count):
+        """Alias for 'limit'"""
+        if count < 0:
+            raise ValueError("Head count cannot be negative")
+        self._iterable = AsyncStreamGenerator.limit(self._iterable, count)
+        return self
+
+    def take_while(self, predicate):
+        """Returns a stream that yields elements based on an (async) predicate"""
+        self._iterable = AsyncStreamGenerator.take_while(self._iterable, predicate)
+        return self
+
+    def drop_while(self, predicate):
+        """Returns a stream that skips elements based on an (async) predicate and yields the remaining ones"""
+        self._iterable = AsyncStreamGenerator.drop_while(self._iterable, predicate)
+        return self
+
+    def enumerate(self, start=0):
+        """Returns each element of the stream preceded by its corresponding index"""
+        self._iterable = AsyncStreamGenerator.enumerate(self._iterable, start)
+        return self
+
+    # ### terminal operations ###
+    async def for_each(self, operation):
+        """Performs an (async) action for each element of this stream"""
+        async for i in self._iterable:
+            await resolve(operation(i))
+
+    async def reduce(self, accumulator, identity=None):
+        """
+        Reduces the elements to a single one, by repeatedly applying an (async) reducing operation.
+        Returns Optional with the result, if any, or None
+        """
+        iterator = aiter(self._iterable)
+        if identity is None:
+            try:
+                identity = await anext(iterator)
+            except StopAsyncIteration:
+                return Optional.of_nullable(identity)
+
+        async for i in iterator:
+            identity = await resolve(accumulator(identity, i))
+        return Optional.of_nullable(identity)
+
+    async def find_first(self, predicate=None):
+        """Returns an Optional with the first element satisfying the (async) predicate, if any, or None"""
+        async for i in self._iterable:
+            if await resolve(predicate(i)) if predicate else i:
+                return Optional.of_nullable(i)
+        return Optional.empty()
+
+    async def take_first(self, default=None):
+        """Returns Optional with the first element of the stream or a default value"""
+        async for i in self._iterable:
+            return Optional.of_nullable(i)
+        return Optional.of_nullable(default)
+
+    async def any_match(self, predicate):
+        """Returns whether any elements of the stream match the given (async) predicate"""
+        async for i in self._iterable:
+            if await resolve(predicate(i)):
+                return True
+        return False
+
+    async def all_match(self, predicate):
+        """Returns whether all elements of the stream match the given (async) predicate"""
+        async for i in self._iterable:
+            if not await resolve(predicate(i)):
+                return False
+        return True
+
+    async def none_match(self, predicate):
+        """Returns whether no elements of the stream match the given (async) predicate"""
+        async for i in self._iterable:
+            if await resolve(predicate(i)):
+                return False
+        return True
+
+    async def min(self, comparator=None, default=None):
+        """Returns Optional with the minimum element of the stream according to the given comparator"""
+        return Optional.of_nullable(
+            min([i async for i in self._iterable], key=comparator, default=default)
+        )
+
+    async def max(self, comparator=None, default=None):
+        """Returns Optional with the maximum element of the stream according to the given comparator"""
+        return Optional.of_nullable(
+            max([i async for i in self._iterable], key=comparator, default=default)
+        )
+
+    async def sum(self):
+        """Sums the elements of the stream"""
+        total = 0
+        async for i in self._iterable:
+            if i is None:
+                continue
+            if not isinstance(i, (int, float)):
+                raise ValueError("Cannot apply sum on non-number elements")
+            total += i
+        return total
+
+    async def to_list(self):
+        """Returns a list of the elements of the current stream"""
+        return [i async for i in self._iterable]
+
+    async def to_tuple(self):
+        """Returns a tuple of the elements of the current stream"""
+        return tuple([i async for i in self._iterable])
+
+    async def to_set(self):
+        """Returns a set of the elements of the current stream"""
+        return {i async for i in self._iterable}
+
+    async def to_dict(self, collector=None, merger=None):
+        """
+        Returns a dict of the elements of the current stream.
+        The 'collector' function returns a (key, value) pair or a DictItem for each element;
+        the 'merger' function resolves collisions of duplicate keys
+        """
+        result = {}
+        async for item in self._iterable:
+            k, v = self._unpack_dict_item(collector(item) if collector else item)
+            if k in result:
+                if merger is None:
+                    raise IllegalStateError(f"Key '{k}' already exists")
+                v = merger(result[k], v)
+            result[k] = v
+        return result
+
+    def _unpack_dict_item(self, item):  # noqa
+        match item:
+            case tuple():
+                return item[0], item[1]
+            case DictItem():
+                return item._key, item._value  # noqa
+            case _:
+                raise UnsupportedTypeError(
+                    f"Cannot create dict items from '{item.__class__.__name__}' type"
+                )
+
+    def close(self):
+        """Closes the stream, causing the provided close handler to be called"""
+        if self._on_close_handler:
+            self._on_close_handler()
+        self._is_consumed = True
+
+    def on_close(self, handler):
+        """Returns an equivalent stream with an additional close handler"""
+        if not callable(handler):
+            raise TypeError(f"'{handler}' is not callable")
+        self._on_close_handler = handler
+        return self
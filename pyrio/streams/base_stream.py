@@ -1,8 +1,9 @@
-from collections.abc import Mapping
+from collections.abc import Mapping, Sequence
 
-from pyrio.iterators import StreamGenerator
+from pyrio.iterators import ConcurrentGenerator, StreamGenerator
+from pyrio.pipeline import EXACT, Plan
 from pyrio.decorators import handle_consumed, pre_call
-from pyrio.utils import DictItem, Optional
+from pyrio.utils import DictItem, HyperLogLog, Optional, StreamCache, SummaryStatistics
 from pyrio.exceptions import IllegalStateError, UnsupportedTypeError, NoneTypeError
 
 
@@ -14,123 +15,267 @@ class BaseStream:
         if iterable is None:
             raise NoneTypeError("Cannot create Stream from None")
         self._iterable = iterable
+        self._plan = Plan()
         self._is_consumed = False
         self._on_close_handler = None
+        self._caches = []
 
     def __iter__(self):
         return iter(self.iterable)
 
     @property
     def iterable(self):
-        if isinstance(self._iterable, Mapping):
-            self._iterable = tuple(DictItem(k, v) for k, v in self._iterable.items())
-        return self._iterable
+        return self._compile()
 
     @iterable.setter
     def iterable(self, value):
         self._iterable = value
 
+    def _compile(self, terminal=None):
+        # optimizes and applies the recorded stages; the optimizer takes into account the calling 'terminal' operation
+        if isinstance(self._iterable, Mapping):
+            self._iterable = tuple(DictItem(k, v) for k, v in self._iterable.items())
+        if self._plan:
+            self._iterable = self._plan.compile(self._iterable, terminal)
+        return self._iterable
+
     def concat(self, *streams):
         """Concatenates several streams together or adds new streams/collections to the current one"""
-        self.iterable = StreamGenerator.concat(self.iterable, *streams)
+        self._plan.add("concat", *streams)
         return self
 
     def prepend(self, iterable):
         """Prepends iterable to current stream"""
-        self.iterable = StreamGenerator.concat(iterable, self.iterable)
+        self._plan.add("prepend", iterable)
         return self
 
     def filter(self, predicate):
         """Filters values in stream based on given predicate function"""
-        self.iterable = StreamGenerator.filter(self.iterable, predicate)
+        self._plan.add("filter", predicate)
         return self
 
     def map(self, mapper):
         """Returns a stream consisting of the results of applying the given function to the elements of this stream"""
-        self.iterable = StreamGenerator.map(self.iterable, mapper)
+        self._plan.add("map", mapper)
         return self
 
     def filter_map(self, mapper, *, discard_falsy=False):
         """Filters out all None or falsy values and applies mapper function to the elements of the stream"""
-        self.iterable = StreamGenerator.filter_map(self.iterable, mapper, discard_falsy)
+        self._plan.add("filter_map", mapper, discard_falsy)
+        return self
+
+    def map_concurrent(self, mapper, max_workers=None, ordered=True, max_in_flight=None):
+        """
+        Applies the mapper function in a pool of 'max_workers' threads - suitable for blocking (I/O-bound) mappers.
+        At most 'max_in_flight' calls are pending at a time (by default twice the number of workers).
+        If 'ordered' is False the results are yielded as soon as they are ready
+        """
+        if max_workers is not None and max_workers < 1:
+            raise ValueError("Workers count must be positive")
+        if max_in_flight is not None and max_in_flight < 1:
+            raise ValueError("In-flight count must be positive")
+        self._plan.add(
+            "map_concurrent",
+            mapper,
+            max_workers,
+            ordered,
+            max_in_flight,
+            func=ConcurrentGenerator.map_concurrent,
+        )
         return self
 
+    def parallel(self, workers=None, ordered=True, chunk_size=None):
+        """
+        Executes the element-wise stages (map, filter, filter_map, flat_map) of the stream in a pool of 'workers'
+        processes (by default one per CPU), processing the elements in chunks (sized automatically if not given).
+        If 'ordered' is False the results are yielded as soon as a chunk is ready.
+        Other stages (sort, distinct, tail, peek etc.) are executed sequentially.
+        NB: the functions passed to the parallel stages and the elements must be picklable
+        """
+        if workers is not None and workers < 1:
+            raise ValueError("Workers count must be positive")
+        if chunk_size is not None and chunk_size < 1:
+            raise ValueError("Chunk size must be positive")
+        self._plan.parallel = (workers, ordered, chunk_size)
+        return self
+
+    def explain(self, terminal=None):
+        """
+        Describes the optimized plan of the stream without executing it:
+        the stages, whether each of them is streaming, buffering or materializing the input,
+        and the applied optimizations. Pass the name of a terminal operation to include it in the plan
+        """
+        return self._plan.explain(self._iterable, terminal)
+
     def flat_map(self, mapper):
         """Maps each element of the stream and yields the elements of the produced iterators"""
-        self.iterable = StreamGenerator.flat_map(self.iterable, mapper)
+        self._plan.add("flat_map", mapper)
+        return self
+
+    def batch(self, size):
+        """Groups the elements of the stream into lists of 'size' elements (the last one may be shorter)"""
+        if size < 1:
+            raise ValueError("Batch size must be positive")
+        self._plan.add("batch", size)
+        return self
+
+    def map_batches(self, mapper, size):
+        """
+        Calls the mapper function with lists of up to 'size' elements and flattens the returned iterables.
+        Suitable for mappers that are cheaper per element when called in bulk
+        """
+        if size < 1:
+            raise ValueError("Batch size must be positive")
+        self._plan.add("map_batches", mapper, size)
+        return self
+
+    def window_aggregate(self, size, step=1, agg="sum"):
+        """
+        Aggregates windows of 'size' consecutive elements, a new one starting every 'step' elements:
+        sliding (step=1), hopping (step < size) or tumbling (step=size) windows; only full windows are aggregated.
+        'agg' is one of "sum", "mean", "min", "max" (or the builtins sum, min and max) - updated incrementally
+        in O(1) amortized time per element - or a custom function receiving a tuple of the window elements
+        """
+        import builtins
+
+        if size < 1:
+            raise ValueError("Window size must be positive")
+        if step < 1:
+            raise ValueError("Window step must be positive")
+        agg = {builtins.sum: "sum", builtins.min: "min", builtins.max: "max"}.get(agg, agg)
+        if isinstance(agg, str) and agg not in ("sum", "mean", "min", "max"):
+            raise ValueError(f"Unsupported aggregation '{agg}'")
+        self._plan.add("window_aggregate", size, step, agg)
         return self
 
     def flatten(self):
         """Converts a Stream of multidimensional collection into a one-dimensional"""
-        self.iterable = StreamGenerator.flatten(self.iterable)
+        self._plan.add("flatten")
         return self
 
     def peek(self, operation):
         """Performs the provided operation on each element of the stream without consuming it"""
-        self.iterable = StreamGenerator.peek(self.iterable, operation)
+        self._plan.add("peek", operation)
         return self
 
-    def distinct(self):
-        """Returns a stream with the distinct elements of the current one"""
-        self.iterable = StreamGenerator.distinct(self.iterable)
+    def distinct(self, approximate=False, error_rate=0.01, capacity=1_000_000):
+        """
+        Returns a stream with the distinct elements of the current one.
+        If 'approximate' is True the seen elements are tracked in a Bloom filter of bounded memory
+        (about 1.2 MB for the default 'capacity' and 'error_rate'): duplicates are never yielded, but while
+        there are at most 'capacity' distinct elements each of them is dropped with probability below 'error_rate'
+        """
+        if approximate:
+            if capacity < 1:
+                raise ValueError("Capacity must be positive")
+            if not 0 < error_rate < 1:
+                raise ValueError("Error rate must be between 0 and 1")
+            self._plan.add("distinct_approximate", error_rate, capacity)
+        else:
+            self._plan.add("distinct")
         return self
 
-    def len(self):
-        """Returns the count of elements in the stream"""
-        return len(tuple(self.iterable))
+    def size_hint(self):
+        """
+        Returns the SizeHint of the stream - the exact number of elements, an upper bound or unknown.
+        Derived from Sized sources without executing the stages
+        """
+        return self._plan.size_hint(self._iterable)
 
-    def _validate_numeric_data(self, op):
-        data = tuple(self.iterable)
-        if not all(isinstance(x, (int, float)) or x is None for x in data):
-            raise ValueError(f"Cannot apply {op} on non-number elements")
-        return [x for x in data if x is not None]
+    def len(self):
+        """
+        Returns the count of elements in the stream.
+        If the size is known in advance (see 'size_hint') and there is no 'peek' stage, the stages are not executed,
+        otherwise the elements are counted without being stored
+        """
+        try:
+            has_peek = any(stage.name == "peek" for stage in self._plan.stages)
+            if not has_peek and (hint := self.size_hint()).kind == EXACT:
+                return hint.size
+            return sum(1 for _ in self._compile("len"))
+        finally:
+            # 'len' doesn't consume the stream but a cached one is still rewound like after a terminal operation
+            if self._caches:
+                self._rewind()
+
+    def _numeric_data(self, op):
+        for x in self._compile(op):
+            if x is None:
+                continue
+            if not isinstance(x, (int, float)):
+                raise ValueError(f"Cannot apply {op} on non-number elements")
+            yield x
 
     def sum(self):
-        """Sums the elements of the stream"""
-        valid_data = self._validate_numeric_data(self.sum.__name__)
-        return sum(valid_data) if valid_data else 0
+        """Sums the elements of the stream in a single pass"""
+        return sum(self._numeric_data(self.sum.__name__))
 
     def average(self):
-        """Returns the average value of elements in the stream"""
-        valid_data = self._validate_numeric_data(self.average.__name__)
-        return sum(valid_data) / len(valid_data) if valid_data else 0
+        """Returns the average value of elements in the stream, computed in a single pass"""
+        import itertools
+
+        # zip pulls from the counter only after an element is received - it ends up at the element count
+        counter = itertools.count()
+        total = sum(x for x, _ in zip(self._numeric_data(self.average.__name__), counter))
+        count = next(counter)
+        return total / count if count else 0
+
+    def count_distinct(self, approximate=False, precision=14):
+        """
+        Returns the number of distinct elements in the stream.
+        If 'approximate' is True it is estimated with HyperLogLog using 2 ** precision bytes of memory -
+        the relative standard error is about 1.04 / sqrt(2 ** precision) (0.81% for the default precision)
+        """
+        if not approximate:
+            return len(set(self._compile("count_distinct")))
+        sketch = HyperLogLog(precision)
+        for i in self._compile("count_distinct"):
+            sketch.add(i)
+        return len(sketch)
+
+    def summary_statistics(self):
+        """Returns count, sum, min, max, mean and variance of the elements, collected in a single pass"""
+        stats = SummaryStatistics()
+        for x in self._numeric_data(self.summary_statistics.__name__):
+            stats.accept(x)
+        return stats
 
     def skip(self, count):
         """Discards the first n elements of the stream and returns a new stream with the remaining ones"""
         if count < 0:
             raise ValueError("Skip count cannot be negative")
-        self.iterable = StreamGenerator.skip(self.iterable, count)
+        self._plan.add("skip", count)
         return self
 
     def limit(self, count):
         """Returns a stream with the first n elements, or fewer if the underlying iterator ends sooner"""
         if count < 0:
             raise ValueError("Limit count cannot be negative")
-        self.iterable = StreamGenerator.limit(self.iterable, count)
+        self._plan.add("limit", count)
         return self
 
     def head(self, count):
         """Alias for 'limit'"""
         if count < 0:
             raise ValueError("Head count cannot be negative")
-        self.iterable = StreamGenerator.limit(self.iterable, count)
+        self._plan.add("limit", count)
         return self
 
     def tail(self, count):
         """Returns a stream with the last n elements, or fewer if the underlying iterator ends sooner"""
         if count < 0:
             raise ValueError("Tail count cannot be negative")
-        self.iterable = StreamGenerator.tail(self.iterable, count)
+        self._plan.add("tail", count)
         return self
 
     def take_while(self, predicate):
         """Returns a stream that yields elements based on a predicate"""
-        self.iterable = StreamGenerator.take_while(self.iterable, predicate)
+        self._plan.add("take_while", predicate)
         return self
 
     def drop_while(self, predicate):
         """Returns a stream that skips elements based on a predicate and yields the remaining ones"""
-        self.iterable = StreamGenerator.drop_while(self.iterable, predicate)
+        self._plan.add("drop_while", predicate)
         return self
 
     def take_first(self, default=None):
@@ -139,25 +284,34 @@ class BaseStream:
 
     def take_last(self, default=None):
         """Returns Optional with the last element of the stream or a default value"""
+        if isinstance(iterable := self.iterable, Sequence):
+            return Optional.of_nullable(iterable[-1] if iterable else default)
+
         from collections import deque
 
-        last_item = deque(self.iterable, maxlen=1)
+        last_item = deque(iterable, maxlen=1)
         return Optional.of_nullable(last_item[0] if last_item else default)
 
-    def sort(self, comparator=None, *, reverse=False):
+    def sort(self, comparator=None, *, reverse=False, memory_limit=None):
         """
         Sorts the elements of the current stream according to natural order or based on the given comparator.
-        If 'reverse' flag is True, the elements are sorted in descending order
+        If 'reverse' flag is True, the elements are sorted in descending order.
+        If 'memory_limit' is given at most that many elements are kept in memory - sorted runs of them are
+        spilled to temporary files and merged lazily (the elements must be picklable)
         """
-        self.iterable = StreamGenerator.sort(self.iterable, comparator, reverse)
+        if memory_limit is not None and memory_limit < 1:
+            raise ValueError("Memory limit must be positive")
+        self._plan.add("sort", comparator, reverse, None, memory_limit)
         return self
 
-    def reverse(self, comparator=None):
+    def reverse(self, comparator=None, *, memory_limit=None):
         """
         Sorts the elements of the current stream in descending order.
         Alias for 'sort(comparator, reverse=True)'
         """
-        self.iterable = StreamGenerator.sort(self.iterable, comparator, reverse=True)
+        if memory_limit is not None and memory_limit < 1:
+            raise ValueError("Memory limit must be positive")
+        self._plan.add("sort", comparator, True, None, memory_limit)
         return self
 
     def find_first(self, predicate=None):
@@ -167,51 +321,118 @@ class BaseStream:
         """
         return Optional.of_nullable(next(filter(predicate, self.iterable), None))
 
+    def sample(self, count, seed=None):
+        """
+        Returns a stream with a uniform random sample of 'count' elements, collected in a single pass
+        (reservoir sampling - only the sampled elements are kept in memory). The order of the sample is arbitrary
+        """
+        if count < 0:
+            raise ValueError("Sample count cannot be negative")
+        self._plan.add("sample", count, seed)
+        return self
+
+    def sample_fraction(self, fraction, seed=None):
+        """Returns a stream in which each element is kept with probability 'fraction', preserving the order"""
+        if not 0 <= fraction <= 1:
+            raise ValueError("Fraction must be between 0 and 1")
+        self._plan.add("sample_fraction", fraction, seed)
+        return self
+
     def find_any(self, predicate=None):
         """
         Searches for an element of the stream that satisfies a predicate.
         Returns an Optional with some of the found values, if any, or None
         """
-        import random
-
         if predicate:
             self.filter(predicate)
-        try:
-            return Optional.of(random.choice(list(self.iterable)))
-        except IndexError:
-            return Optional.of_nullable(None)
+        # reservoir of a single element - a uniform pick in one pass with O(1) memory
+        return Optional.of_nullable(
+            next(StreamGenerator.sample(self._compile("find_any"), 1), None)
+        )
 
     def any_match(self, predicate):
         """Returns whether any elements of the stream match the given predicate"""
-        return any(predicate(i) for i in self.iterable)
+        return any(predicate(i) for i in self._compile("any_match"))
 
     def all_match(self, predicate):
         """Returns whether all elements of the stream match the given predicate"""
-        return all(predicate(i) for i in self.iterable)
+        return all(predicate(i) for i in self._compile("all_match"))
 
     def none_match(self, predicate):
         """Returns whether no elements of the stream match the given predicate"""
-        return not any(predicate(i) for i in self.iterable)
+        return not any(predicate(i) for i in self._compile("none_match"))
 
-    def min(self, comparator=None, default=None):
-        """Returns the minimum element of the stream according to the given comparator"""
+    def min(self, comparator=None, default=None, *, k=None):
+        """
+        Returns the minimum element of the stream according to the given comparator.
+        If 'k' is given returns a list with the k smallest elements in ascending order instead
+        """
+        if k is not None:
+            if k < 0:
+                raise ValueError("Min count cannot be negative")
+            return list(self.sort(comparator).limit(k).iterable)
         return Optional.of_nullable(min(self.iterable, key=comparator, default=default))
 
-    def max(self, comparator=None, default=None):
-        """Returns the maximum element of the stream according to the given comparator"""
+    def max(self, comparator=None, default=None, *, k=None):
+        """
+        Returns the maximum element of the stream according to the given comparator.
+        If 'k' is given returns a list with the k largest elements in descending order instead
+        """
+        if k is not None:
+            if k < 0:
+                raise ValueError("Max count cannot be negative")
+            return list(self.reverse(comparator).limit(k).iterable)
         return Optional.of_nullable(max(self.iterable, key=comparator, default=default))
 
+    def top_k(self, k, comparator=None):
+        """
+        Returns a list with the k largest elements of the stream in descending order.
+        Keeps only k elements in memory; equal elements preserve their encounter order
+        """
+        if k < 0:
+            raise ValueError("Top-k count cannot be negative")
+        return list(self.reverse(comparator).limit(k).iterable)
+
     def for_each(self, operation):
         """Performs an action for each element of this stream"""
         for i in self.iterable:
             operation(i)
 
+    def fork(self, *pipelines, buffer_size=1_024):
+        """
+        Reads the stream once and feeds every element to several sub-pipelines, each running in its own thread.
+        A pipeline is a function receiving a new Stream and applying its own stages and terminal operation,
+        e.g. lambda s: s.distinct().len(). Each of them buffers about 'buffer_size' elements at most -
+        a slow pipeline blocks the reading instead of growing the memory.
+        Returns a tuple with the results of the pipelines
+        """
+        if not pipelines:
+            raise ValueError("At least one pipeline is required")
+        if buffer_size < 1:
+            raise ValueError("Buffer size must be positive")
+        from pyrio.streams.stream import Stream
+
+        def branch(pipeline):
+            def consume(iterable):
+                result = pipeline(Stream(iterable))
+                if isinstance(result, BaseStream):
+                    raise IllegalStateError("Forked pipeline must end with a terminal operation")
+                return result
+
+            return consume
+
+        return tuple(
+            ConcurrentGenerator.broadcast(
+                self._compile("fork"), [branch(pipeline) for pipeline in pipelines], buffer_size
+            )
+        )
+
     def enumerate(self, start=0):
         """
         Returns each element of the Stream preceded by his corresponding index
         (by default starting from 0 if not specified otherwise)
         """
-        self.iterable = StreamGenerator.enumerate(self.iterable, start)
+        self._plan.add("enumerate", start)
         return self
 
     def reduce(self, accumulator, identity=None):
@@ -250,10 +471,17 @@ class BaseStream:
 
         In case of str:
         Concatenates the elements of the Stream, separated by the specified 'str_delimiter'
+
+        In case of a Collector (see pyrio.collectors):
+        Reduces the elements to its result in a single pass - 'teeing' combines several reductions
         """
         import builtins
 
+        from pyrio.collectors import Collector
+
         match collection_type:
+            case Collector():
+                return collection_type.collect(self._compile("collect"))
             case builtins.tuple:
                 return self.to_tuple()
             case builtins.list:
@@ -277,9 +505,22 @@ class BaseStream:
 
     def to_set(self):
         """Returns a set of the elements of the current stream"""
-        return set(self.iterable)
+        return set(self._compile("to_set"))
 
-    def to_dict(self, collector=None, merger=None):
+    def to_numeric(self, dtype=float, chunk_size=None):
+        """
+        Collects the elements into a NumPy-backed NumericStream with vectorized aggregations and arithmetic.
+        The elements are copied into arrays of 'chunk_size' at a time (requires the 'numeric' extra)
+        """
+        from pyrio.streams.numeric_stream import DEFAULT_CHUNK_SIZE, NumericStream
+
+        return NumericStream(
+            self._compile("to_numeric"),
+            dtype,
+            DEFAULT_CHUNK_SIZE if chunk_size is None else chunk_size,
+        )
+
+    def to_dict(self, collector=None, merger=None, memory_limit=None):
         """
         Returns a dict of the elements of the current stream.
 
@@ -288,9 +529,31 @@ class BaseStream:
 
         The 'merger' functions indicates in the case of a collision (duplicate keys), which entry should be kept.
         E.g. lambda old, new: new
+
+        If 'memory_limit' (number of keys) is exceeded while merging, the entries are hash-partitioned
+        to temporary files and merged bucket by bucket - the result stays the same (keys and values must be picklable)
         """
-        result = {}
+        if memory_limit is not None and memory_limit < 1:
+            raise ValueError("Memory limit must be positive")
         source = (collector(i) for i in self.iterable) if collector else self.iterable
+        if memory_limit is not None:
+
+            def merge(key, old, new):
+                if merger is None:
+                    raise IllegalStateError(f"Key '{key}' already exists")
+                return merger(old, new)
+
+            return dict(
+                StreamGenerator.spill_grouped(
+                    map(self._unpack_dict_item, source),
+                    initial=lambda v: v,
+                    fold=merge,
+                    memory_limit=memory_limit,
+                    counts_values=False,
+                )
+            )
+
+        result = {}
         for item in source:
             k, v = self._unpack_dict_item(item)
             if k in result:
@@ -316,18 +579,30 @@ class BaseStream:
         """Concatenates the elements of the Stream, separated by the specified delimiter"""
         return self._join(delimiter)
 
-    def group_by(self, classifier=None, collector=None):
+    def group_by(self, classifier=None, collector=None, memory_limit=None, hashed=False):
         """
         Performs a "group by" operation on the elements of the stream according to a classification function.
         Returns the results in a dict built using collector function
         (optionally provided by the user or via a default one)
+
+        By default consecutive elements with equal keys form a group; with 'hashed' all elements with equal keys
+        form a single group, in first-seen key order. 'memory_limit' never changes the result:
+        consecutive grouping holds a single group at a time anyway, while hash grouping past 'memory_limit' elements
+        is hash-partitioned to temporary files and done bucket by bucket (keys and elements must be picklable)
         """
+        if memory_limit is not None and memory_limit < 1:
+            raise ValueError("Memory limit must be positive")
+        if hashed:
+            groups = self._hash_group_by(classifier, memory_limit)
+        else:
+            groups = ((key, list(group)) for key, group in self._group_by(classifier))
+
         if collector is None:
-            return {key: list(group) for key, group in self._group_by(classifier)}
+            return dict(groups)
 
         result = {}
-        for key, group in self._group_by(classifier):
-            key, group = collector(key, list(group))
+        for key, group in groups:
+            key, group = collector(key, group)
             if hasattr(group, "__iter__"):
                 if key not in result:
                     result[key] = []
@@ -336,6 +611,40 @@ class BaseStream:
                 result[key] = group
         return result
 
+    def aggregate_by(
+        self, classifier=None, *, count=False, sum=None, min=None, max=None, mean=None
+    ):  # noqa
+        """
+        Hash-based "group by" computing running aggregations per key in a single pass - no per-group lists.
+        Each of 'sum', 'min', 'max' and 'mean' takes a function extracting the value from an element
+        (or True to use the element itself); None values are skipped. 'count' is a flag (the default aggregation).
+        Returns {key: value} for a single aggregation or {key: {name: value}} for several, in first-seen key order
+        """
+        from pyrio.utils.aggregation import aggregate_by
+
+        requested = {"count": count, "sum": sum, "min": min, "max": max, "mean": mean}
+        aggregations = {
+            name: (lambda x: x) if option is True else option
+            for name, option in requested.items()
+            if option
+        } or {"count": None}
+        classifier = (lambda x: x) if classifier is None else classifier
+        return aggregate_by(self._compile("aggregate_by"), classifier, aggregations)
+
+    def _hash_group_by(self, classifier, memory_limit):
+        classifier = (lambda x: x) if classifier is None else classifier
+        if memory_limit is None:
+            groups = {}
+            for i in self.iterable:
+                groups.setdefault(classifier(i), []).append(i)
+            return groups.items()
+        return StreamGenerator.spill_grouped(
+            ((classifier(i), i) for i in self.iterable),
+            initial=lambda v: [v],
+            fold=lambda k, group, v: group.append(v) or group,
+            memory_limit=memory_limit,
+        )
+
     def _group_by(self, classifier=None):
         # https://docs.python.org/3/library/itertools.html#itertools.groupby
         classifier = (lambda x: x) if classifier is None else classifier
@@ -370,8 +679,32 @@ class BaseStream:
         """Count how many of the elements are Truthy or evaluate to True based on a given predicate"""
         return sum(self.map(predicate))
 
+    def cache(self, storage="memory", max_size=None):
+        """
+        Makes the stream replayable: it is materialized once, on the next terminal operation,
+        and every terminal operation after that rewinds the stream to the cached elements instead of consuming it.
+        With storage="memory" the elements are kept in memory - if 'max_size' is given, only the first that many of them,
+        the rest being read back from a temporary file on every replay; storage="disk" keeps them in a temporary file.
+        The cache is removed when the stream is closed (the elements must be picklable if they reach the disk)
+        """
+        if storage not in ("memory", "disk"):
+            raise ValueError(f"Unsupported storage '{storage}'")
+        if max_size is not None and max_size < 0:
+            raise ValueError("Cache size cannot be negative")
+        cache = StreamCache(self._compile(), 0 if storage == "disk" else max_size)
+        self._caches.append(cache)
+        self._iterable = cache
+        return self
+
+    def _rewind(self):
+        # drops the stages added after the last cache - called instead of 'close' after terminal operations
+        self._plan.stages = []
+        self._iterable = self._caches[-1]
+
     def close(self):
         """Closes the stream, causing the provided close handler to be called"""
+        for cache in self._caches:
+            cache.close()
         if self._on_close_handler:
             self._on_close_handler()
         self._is_consumed = True
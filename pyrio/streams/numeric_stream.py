@@ -0,0 +1,157 @@
+import itertools
+import operator
+
+import numpy as np
+
+from pyrio.exceptions import NoneTypeError
+from pyrio.utils import Optional
+
+DEFAULT_CHUNK_SIZE = 65_536
+
+
+class NumericStream:
+    """NumPy-backed stream of numbers - aggregations and arithmetic are vectorized"""
+
+    def __init__(self, data, dtype=float, chunk_size=DEFAULT_CHUNK_SIZE):
+        if data is None:
+            raise NoneTypeError("Cannot create NumericStream from None")
+        if chunk_size < 1:
+            raise ValueError("Chunk size must be positive")
+        self._array = self._to_array(data, dtype, chunk_size)
+
+    @staticmethod
+    def _to_array(data, dtype, chunk_size):
+        # fills fixed-size arrays from the iterable and joins them once instead of growing a list
+        if isinstance(data, np.ndarray):
+            return data.astype(dtype, copy=False).ravel()
+        numbers = NumericStream._numbers(data)
+        chunks = []
+        while len(chunk := np.fromiter(itertools.islice(numbers, chunk_size), dtype)):
+            chunks.append(chunk)
+        return np.concatenate(chunks) if chunks else np.empty(0, dtype)
+
+    @staticmethod
+    def _numbers(data):
+        # None values are skipped as Stream.sum does - NaN is a number and is kept
+        for x in data:
+            if x is None:
+                continue
+            if not isinstance(x, (int, float, np.number)):
+                raise ValueError("Cannot apply to_numeric on non-number elements")
+            yield x
+
+    @classmethod
+    def _of_array(cls, array):
+        stream = cls.__new__(cls)
+        stream._array = array
+        return stream
+
+    @property
+    def array(self):
+        """Returns the underlying NumPy array"""
+        return self._array
+
+    def __iter__(self):
+        return iter(self._array.tolist())
+
+    def __len__(self):
+        return len(self._array)
+
+    def __repr__(self):
+        return f"NumericStream({self._array!r})"
+
+    def len(self):
+        """Returns the count of elements in the stream"""
+        return len(self._array)
+
+    def sum(self):
+        """Sums the elements of the stream"""
+        return self._array.sum().item()
+
+    def average(self):
+        """Returns the average value of elements in the stream"""
+        return self._array.mean().item() if len(self._array) else 0
+
+    def min(self, default=None):
+        """Returns Optional with the minimum element of the stream or a default value"""
+        return Optional.of_nullable(self._array.min().item() if len(self._array) else default)
+
+    def max(self, default=None):
+        """Returns Optional with the maximum element of the stream or a default value"""
+        return Optional.of_nullable(self._array.max().item() if len(self._array) else default)
+
+    def std(self, ddof=0):
+        """Returns the standard deviation of elements in the stream"""
+        return self._array.std(ddof=ddof).item() if len(self._array) > ddof else 0
+
+    def percentile(self, q):
+        """Returns the q-th percentile (or a list of percentiles if q is a sequence) of the stream"""
+        if not len(self._array):
+            raise ValueError("Cannot compute percentile of an empty stream")
+        return np.percentile(self._array, q).tolist()
+
+    def map(self, func):
+        """Applies a vectorized function (e.g. a NumPy ufunc) to the whole stream"""
+        return self._of_array(np.asarray(func(self._array)))
+
+    def filter(self, predicate):
+        """Keeps the elements for which the vectorized predicate returns True"""
+        return self._of_array(self._array[predicate(self._array)])
+
+    def to_list(self):
+        """Returns a list of the elements in the stream"""
+        return self._array.tolist()
+
+    def to_stream(self):
+        """Returns a Stream of the elements"""
+        from pyrio.streams import Stream
+
+        return Stream(self._array.tolist())
+
+    def _apply(self, op, other, reflected=False):
+        if isinstance(other, NumericStream):
+            other = other._array
+        left, right = (other, self._array) if reflected else (self._array, other)
+        return self._of_array(op(left, right))
+
+    def __add__(self, other):
+        return self._apply(operator.add, other)
+
+    def __radd__(self, other):
+        return self._apply(operator.add, other, reflected=True)
+
+    def __sub__(self, other):
+        return self._apply(operator.sub, other)
+
+    def __rsub__(self, other):
+        return self._apply(operator.sub, other, reflected=True)
+
+    def __mul__(self, other):
+        return self._apply(operator.mul, other)
+
+    def __rmul__(self, other):
+        return self._apply(operator.mul, other, reflected=True)
+
+    def __truediv__(self, other):
+        return self._apply(operator.truediv, other)
+
+    def __rtruediv__(self, other):
+        return self._apply(operator.truediv, other, reflected=True)
+
+    def __floordiv__(self, other):
+        return self._apply(operator.floordiv, other)
+
+    def __rfloordiv__(self, other):
+        return self._apply(operator.floordiv, other, reflected=True)
+
+    def __mod__(self, other):
+        return self._apply(operator.mod, other)
+
+    def __pow__(self, other):
+        return self._apply(operator.pow, other)
+
+    def __neg__(self):
+        return self._of_array(-self._array)
+
+    def __abs__(self):
+        return self._of_array(abs(self._array))
@@ -42,7 +42,7 @@ class Stream(BaseStream, ItertoolsMixin):
     @classmethod
     def from_range(cls, start, stop, step=1):
         """Creates Stream from start (inclusive) to stop (exclusive) by an incremental step"""
-        return cls(StreamGenerator.range(start, stop, step))
+        return cls(range(start, stop, step))
 
     # NB: handle_consumed decorator needs access to toggle flag
     def take_nth(self, idx, default=None):
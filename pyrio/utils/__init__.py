@@ -1,2 +1,5 @@
 from .dict_item import DictItem as DictItem
 from .optional import Optional as Optional
+from .summary_statistics import SummaryStatistics as SummaryStatistics
+from .sketches import BloomFilter as BloomFilter, HyperLogLog as HyperLogLog
+from .stream_cache import StreamCache as StreamCache
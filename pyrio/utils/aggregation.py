@@ -0,0 +1,60 @@
+_MISSING = object()
+
+
+def _count(acc, value):
+    return acc + 1
+
+
+def _sum(acc, value):
+    return acc if value is None else acc + value
+
+
+def _min(acc, value):
+    return acc if value is None or (acc is not _MISSING and acc <= value) else value
+
+
+def _max(acc, value):
+    return acc if value is None or (acc is not _MISSING and acc >= value) else value
+
+
+def _mean(acc, value):
+    return acc if value is None else (acc[0] + value, acc[1] + 1)
+
+
+# name -> (initial state, update(state, value), finalize(state))
+AGGREGATIONS = {
+    "count": (0, _count, None),
+    "sum": (0, _sum, None),
+    "min": (_MISSING, _min, lambda acc: None if acc is _MISSING else acc),
+    "max": (_MISSING, _max, lambda acc: None if acc is _MISSING else acc),
+    "mean": ((0, 0), _mean, lambda acc: acc[0] / acc[1] if acc[1] else 0),
+}
+
+
+def aggregate_by(iterable, classifier, aggregations):
+    """
+    Groups the elements by the key returned by the classifier in a hash table, keeping a running state
+    per key and aggregation. 'aggregations' maps names from AGGREGATIONS to value extractors.
+    Returns {key: value} for a single aggregation or {key: {name: value}} for several, in first-seen key order
+    """
+    names = tuple(aggregations)
+    extractors = tuple(extract or (lambda x: x) for extract in aggregations.values())
+    initials = [AGGREGATIONS[name][0] for name in names]
+    updates = tuple(AGGREGATIONS[name][1] for name in names)
+    indices = range(len(names))
+
+    states = {}
+    for element in iterable:
+        key = classifier(element)
+        if (state := states.get(key)) is None:
+            state = states[key] = initials.copy()
+        for idx in indices:
+            state[idx] = updates[idx](state[idx], extractors[idx](element))
+
+    finalizers = [AGGREGATIONS[name][2] or (lambda acc: acc) for name in names]
+    if len(names) == 1:
+        return {key: finalizers[0](state[0]) for key, state in states.items()}
+    return {
+        key: {name: finalize(acc) for name, finalize, acc in zip(names, finalizers, state)}
+        for key, state in states.items()
+    }
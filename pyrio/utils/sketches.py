@@ -0,0 +1,116 @@
+import hashlib
+import math
+import struct
+
+MASK_64 = (1 << 64) - 1
+
+
+def hash_64(element):
+    """
+    64-bit hash of a stable byte encoding of the element (blake2b).
+    Numbers, strings, bytes and tuples of them are encoded by value - equal numbers (1, 1.0, True) hash alike;
+    other objects are encoded by their built-in hash, so they keep its collisions
+    """
+    return int.from_bytes(hashlib.blake2b(_encode(element), digest_size=8).digest(), "little")
+
+
+def _encode(element):
+    match element:
+        case str():
+            return b"s" + element.encode("utf-8", "surrogatepass")
+        case bytes():
+            return b"b" + element
+        case int():
+            return b"i" + int(element).to_bytes(
+                int(element).bit_length() // 8 + 1, "little", signed=True
+            )
+        case float() if element.is_integer():
+            return _encode(int(element))
+        case float():
+            return b"f" + struct.pack("<d", element)
+        case tuple():
+            parts = [_encode(x) for x in element]
+            return b"t" + b"".join(len(part).to_bytes(8, "little") + part for part in parts)
+        case _:
+            # hash() is at most 64 bits wide; it is the only encoding every hashable object has
+            return b"h" + hash(element).to_bytes(8, "little", signed=True)
+
+
+class BloomFilter:
+    """
+    Probabilistic set membership with bounded memory.
+    Never reports a false negative; while at most 'capacity' elements are added
+    the probability of a false positive stays below 'error_rate' (it grows past the capacity)
+    """
+
+    def __init__(self, capacity, error_rate=0.01):
+        if capacity < 1:
+            raise ValueError("Capacity must be positive")
+        if not 0 < error_rate < 1:
+            raise ValueError("Error rate must be between 0 and 1")
+        self._size = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        self._hash_count = max(1, round(self._size / capacity * math.log(2)))
+        self._bits = bytearray((self._size + 7) // 8)
+
+    @property
+    def size_in_bytes(self):
+        return len(self._bits)
+
+    def _positions(self, element):
+        # double hashing: k positions derived from the two halves of a single 64-bit hash
+        h = hash_64(element)
+        position, step, size = h & 0xFFFFFFFF, (h >> 32) | 1, self._size
+        for _ in range(self._hash_count):
+            yield position % size
+            position += step
+
+    def add(self, element):
+        """Adds the element; returns False if it was (probably) present already"""
+        bits = self._bits
+        added = False
+        for position in self._positions(element):
+            byte, mask = position >> 3, 1 << (position & 7)
+            if not bits[byte] & mask:
+                bits[byte] |= mask
+                added = True
+        return added
+
+    def __contains__(self, element):
+        bits = self._bits
+        return all(bits[p >> 3] & (1 << (p & 7)) for p in self._positions(element))
+
+
+class HyperLogLog:
+    """
+    Cardinality estimator using 2 ** precision one-byte registers.
+    The relative standard error is about 1.04 / sqrt(2 ** precision) - 0.81% for the default precision of 14 (16 KB)
+    """
+
+    def __init__(self, precision=14):
+        if not 4 <= precision <= 16:
+            raise ValueError("Precision must be between 4 and 16")
+        self._precision = precision
+        self._registers = bytearray(1 << precision)
+
+    def add(self, element):
+        """Records the element"""
+        h = hash_64(element)
+        bits = 64 - self._precision
+        rank = bits - (h & ((1 << bits) - 1)).bit_length() + 1
+        idx = h >> bits
+        if rank > self._registers[idx]:
+            self._registers[idx] = rank
+
+    def __len__(self):
+        return round(self.estimate())
+
+    def estimate(self):
+        """Returns the estimated number of distinct elements"""
+        m = len(self._registers)
+        alpha = {16: 0.673, 32: 0.697, 64: 0.709}.get(m, 0.7213 / (1 + 1.079 / m))
+        estimate = alpha * m * m / sum(2.0**-r for r in self._registers)
+        zeros = self._registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            # small range correction - linear counting
+            return m * math.log(m / zeros)
+        return estimate
@@ -0,0 +1,84 @@
+import itertools
+
+from pyrio.exceptions import IllegalStateError
+
+# number of elements stored (and spilled) together
+CACHE_CHUNK_SIZE = 1_024
+_FAILED = object()
+
+
+class StreamCache:
+    """
+    Replayable storage of the elements of an iterable - filled once, on the first iteration, and read any number of times.
+    Elements are kept in chunks of CACHE_CHUNK_SIZE; if 'max_size' is given only the first that many elements
+    stay in memory - the rest are written once to a temporary file and streamed back from it on every replay.
+    max_size=0 keeps everything on disk
+    """
+
+    def __init__(self, iterable, max_size=None):
+        self._source = iterable
+        self._max_size = max_size
+        self._chunks = []
+        self._offsets = []
+        self._file = None
+
+    @property
+    def is_filled(self):
+        return self._source is None
+
+    def __iter__(self):
+        self._fill()
+        for chunk in self._chunks:
+            yield from chunk
+        if self._offsets:
+            import pickle
+
+            for offset in self._offsets:
+                # several replays may read the file at the same time
+                self._file.seek(offset)
+                yield from pickle.load(self._file)
+
+    def _fill(self):
+        if self._source is None:
+            return
+        if self._source is _FAILED:
+            raise IllegalStateError("Stream cache could not be filled")
+        iterator = iter(self._source)
+        try:
+            room = self._max_size
+            for chunk in iter(lambda: list(itertools.islice(iterator, CACHE_CHUNK_SIZE)), []):
+                if room is None or room >= len(chunk):
+                    self._chunks.append(chunk)
+                elif room > 0:
+                    # the chunk on the boundary is split - the memory budget is kept exactly
+                    self._chunks.append(chunk[:room])
+                    self._spill(chunk[room:])
+                else:
+                    self._spill(chunk)
+                if room is not None:
+                    room = max(room - len(chunk), 0)
+        except BaseException:
+            # the source is half-consumed - replaying it would silently drop elements
+            self.close()
+            self._source = _FAILED
+            raise
+        self._source = None
+
+    def _spill(self, chunk):
+        import pickle
+        import tempfile
+
+        if self._file is None:
+            self._file = tempfile.TemporaryFile()
+        self._file.seek(0, 2)
+        self._offsets.append(self._file.tell())
+        pickle.dump(chunk, self._file, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def close(self):
+        """Drops the cached elements and removes the temporary file"""
+        self._chunks.clear()
+        self._offsets.clear()
+        self._source = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
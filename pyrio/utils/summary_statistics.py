@@ -0,0 +1,84 @@
+import math
+
+
+class SummaryStatistics:
+    """
+    Count, sum, min, max, mean and variance of numbers collected in a single pass with O(1) memory.
+    Mean and variance are updated with Welford's algorithm
+    """
+
+    def __init__(self):
+        self._count = 0
+        self._sum = 0
+        self._min = None
+        self._max = None
+        self._mean = 0.0
+        self._m2 = 0.0
+
+    def accept(self, value):
+        """Records a new value"""
+        self._count += 1
+        self._sum += value
+        if self._min is None or value < self._min:
+            self._min = value
+        if self._max is None or value > self._max:
+            self._max = value
+        delta = value - self._mean
+        self._mean += delta / self._count
+        self._m2 += delta * (value - self._mean)
+
+    def combine(self, other):
+        """Merges the statistics of another instance into this one"""
+        if other._count == 0:
+            return self
+        if self._count == 0:
+            self.__dict__.update(other.__dict__)
+            return self
+        count = self._count + other._count
+        delta = other._mean - self._mean
+        self._m2 += other._m2 + delta * delta * self._count * other._count / count
+        self._mean += delta * other._count / count
+        self._count = count
+        self._sum += other._sum
+        self._min = min(self._min, other._min)
+        self._max = max(self._max, other._max)
+        return self
+
+    @property
+    def count(self):
+        return self._count
+
+    @property
+    def sum(self):
+        return self._sum
+
+    @property
+    def min(self):
+        return self._min
+
+    @property
+    def max(self):
+        return self._max
+
+    @property
+    def mean(self):
+        return self._mean if self._count else 0
+
+    @property
+    def variance(self):
+        """Population variance"""
+        return self._m2 / self._count if self._count else 0
+
+    @property
+    def sample_variance(self):
+        return self._m2 / (self._count - 1) if self._count > 1 else 0
+
+    @property
+    def std(self):
+        return math.sqrt(self.variance)
+
+    def __repr__(self):
+        return (
+            f"SummaryStatistics(count={self.count}, sum={self.sum}, min={self.min}, "
+            f"max={self.max}, mean={self.mean}, variance={self.variance})"
+        )
@@ -0,0 +1,187 @@
+import asyncio
+
+import pytest
+
+from pyrio import AsyncStream, DictItem, Optional
+from pyrio.exceptions import IllegalStateError, NoneTypeError
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+async def arange(n):
+    for i in range(n):
+        await asyncio.sleep(0)
+        yield i
+
+
+async def double(x):
+    await asyncio.sleep(0)
+    return x * 2
+
+
+def test_async_stream_from_none():
+    with pytest.raises(NoneTypeError) as e:
+        AsyncStream(None)
+    assert str(e.value) == "Cannot create AsyncStream from None"
+
+
+def test_async_stream_of():
+    assert run(AsyncStream.of(1, 2, 3).to_list()) == [1, 2, 3]
+    assert run(AsyncStream.of_nullable(None).to_list()) == []
+    assert run(AsyncStream.empty().to_tuple()) == ()
+
+
+def test_async_stream_from_async_iterable():
+    assert run(AsyncStream(arange(5)).map(double).filter(lambda x: x > 2).to_list()) == [4, 6, 8]
+
+
+def test_async_stream_from_dict():
+    assert run(AsyncStream({"x": 1, "y": 2}).map(lambda x: x.key).to_list()) == ["x", "y"]
+
+
+def test_async_filter_coroutine_predicate():
+    async def is_even(x):
+        return x % 2 == 0
+
+    assert run(AsyncStream(range(7)).filter(is_even).to_list()) == [0, 2, 4, 6]
+
+
+def test_async_map_concurrency():
+    active, max_active = 0, 0
+
+    async def fetch(x):
+        nonlocal active, max_active
+        active += 1
+        max_active = max(max_active, active)
+        await asyncio.sleep(0.01 * (5 - x % 5))
+        active -= 1
+        return x * 10
+
+    assert run(AsyncStream(range(20)).map(fetch, concurrency=5).to_list()) == [
+        x * 10 for x in range(20)
+    ]
+    assert max_active == 5
+
+
+def test_async_map_unordered():
+    async def fetch(x):
+        await asyncio.sleep(0.01 * (3 - x))
+        return x
+
+    assert run(AsyncStream.of(0, 1, 2).map(fetch, concurrency=3, ordered=False).to_list()) == [
+        2,
+        1,
+        0,
+    ]
+
+
+def test_async_map_invalid_concurrency():
+    with pytest.raises(ValueError) as e:
+        AsyncStream.of(1, 2).map(double, concurrency=0)
+    assert str(e.value) == "Concurrency must be positive"
+
+
+def test_async_flat_map():
+    assert run(AsyncStream.of(2, 3).flat_map(arange).to_list()) == [0, 1, 0, 1, 2]
+    assert run(AsyncStream.of([1, 2], [3]).flat_map(lambda x: x).to_list()) == [1, 2, 3]
+
+
+def test_async_intermediate_operations():
+    result = run(
+        AsyncStream.of(None, 1, 1, 2, 3, 4, 5, 6)
+        .filter_map(lambda x: x * 10)
+        .distinct()
+        .skip(1)
+        .drop_while(lambda x: x < 30)
+        .take_while(lambda x: x < 60)
+        .enumerate(start=1)
+        .to_list()
+    )
+    assert result == [(1, 30), (2, 40), (3, 50)]
+
+
+def test_async_limit_infinite_stream():
+    async def naturals():
+        i = 0
+        while True:
+            yield i
+            i += 1
+
+    assert run(AsyncStream(naturals()).map(double, concurrency=4).head(3).to_list()) == [0, 2, 4]
+    assert run(AsyncStream(naturals()).limit(0).to_list()) == []
+
+
+def test_async_concat_and_peek():
+    seen = []
+    result = run(AsyncStream.of(1, 2).concat(arange(2), [9]).peek(seen.append).to_list())
+    assert result == [1, 2, 0, 1, 9]
+    assert seen == result
+
+
+def test_async_reduce():
+    result = run(AsyncStream(arange(5)).reduce(lambda acc, x: acc + x))
+    assert isinstance(result, Optional)
+    assert result.get() == 10
+    assert run(AsyncStream.of(1, 2).reduce(lambda acc, x: acc * x, identity=5)).get() == 10
+    assert run(AsyncStream.empty().reduce(lambda acc, x: acc + x)).is_empty()
+
+
+def test_async_find_and_match():
+    assert run(AsyncStream.of(1, 2, 3).find_first(lambda x: x > 1)).get() == 2
+    assert run(AsyncStream.of(1, 2, 3).find_first(lambda x: x > 5)).is_empty()
+    assert run(AsyncStream.of(4, 5).take_first()).get() == 4
+    assert run(AsyncStream.empty().take_first(default=33)).get() == 33
+    assert run(AsyncStream.of(1, 2, 3).any_match(lambda x: x > 2))
+    assert run(AsyncStream.of(1, 2, 3).all_match(lambda x: x > 2)) is False
+    assert run(AsyncStream.of(1, 2, 3).none_match(lambda x: x < 0))
+
+
+def test_async_aggregations():
+    assert run(AsyncStream.of(2, 1, 3).min()).get() == 1
+    assert run(AsyncStream.of(2, 1, 3).max()).get() == 3
+    assert run(AsyncStream.empty().max(default=7)).get() == 7
+    assert run(AsyncStream.of(1, None, 2.5).sum()) == 3.5
+    with pytest.raises(ValueError) as e:
+        run(AsyncStream.of(1, "a").sum())
+    assert str(e.value) == "Cannot apply sum on non-number elements"
+
+
+def test_async_collectors():
+    assert run(AsyncStream.of(1, 1, 2).to_set()) == {1, 2}
+    assert run(AsyncStream.of(1, 2).to_dict(lambda x: (str(x), x))) == {"1": 1, "2": 2}
+    assert run(AsyncStream.of(1, 2).to_dict(lambda x: DictItem(x, x * 2))) == {1: 2, 2: 4}
+    with pytest.raises(IllegalStateError) as e:
+        run(AsyncStream.of(1, 1).to_dict(lambda x: (x, x)))
+    assert str(e.value) == "Key '1' already exists"
+    assert run(AsyncStream.of(1, 1).to_dict(lambda x: (x, x), lambda old, new: old + new)) == {1: 2}
+
+
+def test_async_for_each():
+    result = []
+
+    async def collect(x):
+        result.append(x)
+
+    run(AsyncStream.of(1, 2, 3).for_each(collect))
+    assert result == [1, 2, 3]
+
+
+def test_async_iteration():
+    async def consume():
+        return [i async for i in AsyncStream(arange(3))]
+
+    assert run(consume()) == [0, 1, 2]
+
+
+def test_async_stream_consumed():
+    stream = AsyncStream.of(1, 2).on_close(lambda: closed.append(True))
+    closed = []
+    assert run(stream.to_list()) == [1, 2]
+    assert closed == [True]
+    with pytest.raises(IllegalStateError) as e:
+        run(stream.to_list())
+    assert str(e.value) == "Stream object already consumed"
+    with pytest.raises(IllegalStateError):
+        stream.map(str)
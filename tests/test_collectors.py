@@ -0,0 +1,101 @@
+import pytest
+
+from pyrio import Stream
+from pyrio import collectors as C
+
+
+def test_counting_summing_averaging():
+    assert Stream([1, 2, 3, 4]).collect(C.counting()) == 4
+    assert Stream([1, 2, 3, 4]).collect(C.summing()) == 10
+    assert Stream(["a", "bb", "ccc"]).collect(C.summing(len)) == 6
+    assert Stream([1, 2, 3, 4]).collect(C.averaging()) == 2.5
+    assert Stream([]).collect(C.averaging()) == 0
+
+
+def test_min_by_max_by(Foo):
+    coll = [Foo("fizz", 3), Foo("buzz", 1), Foo("jazz", 3), Foo("mambo", 1)]
+    assert Stream(coll).collect(C.min_by(lambda x: x.num)).get().name == "buzz"
+    assert Stream(coll).collect(C.max_by(lambda x: x.num)).get().name == "fizz"
+    assert Stream([4, 1, 7]).collect(C.max_by()).get() == 7
+    assert Stream([]).collect(C.min_by()).is_empty()
+
+
+def test_joining():
+    assert Stream([1, 2, 3]).collect(C.joining()) == "123"
+    assert Stream([1, 2, 3]).collect(C.joining(", ", "[", "]")) == "[1, 2, 3]"
+    assert Stream([]).collect(C.joining(", ", "[", "]")) == "[]"
+
+
+def test_mapping_filtering():
+    assert Stream(["a", "bb", "ccc"]).collect(C.mapping(len, C.to_list())) == [1, 2, 3]
+    assert Stream([1, 2, 3, 4]).collect(C.filtering(lambda x: x % 2, C.to_set())) == {1, 3}
+
+
+def test_grouping_by(Foo):
+    assert Stream("ABCABA").collect(C.grouping_by(lambda x: x)) == {
+        "A": ["A", "A", "A"],
+        "B": ["B", "B"],
+        "C": ["C"],
+    }
+    coll = [Foo("fizz", 1), Foo("buzz", 2), Foo("fizz", 3)]
+    assert Stream(coll).collect(C.grouping_by(lambda x: x.name, C.summing(lambda x: x.num))) == {
+        "fizz": 4,
+        "buzz": 2,
+    }
+    assert Stream(coll).collect(
+        C.grouping_by(lambda x: x.name, C.mapping(lambda x: x.num, C.joining("-")))
+    ) == {"fizz": "1-3", "buzz": "2"}
+
+
+def test_partitioning_by():
+    assert Stream(range(6)).collect(C.partitioning_by(lambda x: x % 2 == 0)) == {
+        True: [0, 2, 4],
+        False: [1, 3, 5],
+    }
+    assert Stream([]).collect(C.partitioning_by(bool, C.counting())) == {True: 0, False: 0}
+
+
+def test_teeing_single_pass():
+    consumed = []
+    stream = Stream(range(1, 6)).peek(consumed.append)
+    count, total, low, high, mean = stream.collect(
+        C.teeing(C.counting(), C.summing(), C.min_by(), C.max_by(), C.averaging())
+    )
+    assert (count, total, low.get(), high.get(), mean) == (5, 15, 1, 5, 3.0)
+    assert consumed == [1, 2, 3, 4, 5]
+
+
+def test_teeing_merger():
+    assert (
+        Stream([2, 4, 6]).collect(
+            C.teeing(C.summing(), C.counting(), merger=lambda total, count: total / count)
+        )
+        == 4.0
+    )
+    assert Stream(range(10)).collect(
+        C.grouping_by(lambda x: x % 3, C.teeing(C.counting(), C.to_list()))
+    ) == {0: (4, [0, 3, 6, 9]), 1: (3, [1, 4, 7]), 2: (3, [2, 5, 8])}
+
+
+def test_teeing_raises():
+    with pytest.raises(ValueError) as e:
+        C.teeing()
+    assert str(e.value) == "At least one collector is required"
+
+
+def test_collector_consumes_stream():
+    from pyrio.exceptions import IllegalStateError
+
+    stream = Stream([1, 2, 3])
+    assert stream.collect(C.counting()) == 3
+    with pytest.raises(IllegalStateError):
+        stream.collect(C.counting())
+
+
+def test_custom_collector():
+    product = C.Collector(lambda: 1, lambda acc, x: acc * x)
+    assert Stream([1, 2, 3, 4]).collect(product) == 24
+    assert Stream(["b", "a"]).collect(C.Collector(list, lambda acc, x: acc + [x], sorted)) == [
+        "a",
+        "b",
+    ]
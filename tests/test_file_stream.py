@@ -161,6 +161,21 @@ def test_reusing_stream():
     assert str(e.value) == "Stream object already consumed"
 
 
+def test_cached_stream():
+    stream = FileStream("./tests/resources/foo.json").map(lambda x: f"{x.key}=>{x.value}").cache()
+    assert stream.tail(1).to_tuple() == ("qwerty=>42",)
+    assert stream._is_consumed is False
+    assert stream.len() == 2
+    assert stream.filter(lambda x: x.startswith("abc")).cache("disk").to_list() == ["abc=>xyz"]
+    assert stream.to_list() == ["abc=>xyz"]
+
+    stream.close()
+    assert stream._file_handler.closed
+    with pytest.raises(IllegalStateError) as e:
+        stream.to_list()
+    assert str(e.value) == "Stream object already consumed"
+
+
 def test_concat():
     assert (
         FileStream("./tests/resources/long.json")
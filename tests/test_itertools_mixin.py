@@ -175,6 +175,29 @@ def test_non_existing_function_called():
     assert str(e.value) == "'foo' not found"
 
 
+def test_positional_args():
+    assert Stream.of(1, 2, 3, 4).accumulate(operator.mul).to_list() == [1, 2, 6, 24]
+    assert Stream.of(1, 2, 3, 4).combinations(2).len() == 6
+    assert Stream("ABCDEF").compress([1, 0, 1]).to_list() == ["A", "C"]
+    assert Stream("ABCDEFG").islice(1, None, 3).to_list() == ["B", "E"]
+    assert Stream.of(1, 4, 6, 3).takewhile(lambda x: x < 5).to_list() == [1, 4]
+    assert Stream.empty().count(3, 2).limit(3).to_list() == [3, 5, 7]
+
+
+def test_itertools_functions_are_methods(monkeypatch):
+    from pyrio.iterators import ItertoolsMixin
+
+    assert "accumulate" in vars(ItertoolsMixin)
+    assert Stream.accumulate.__name__ == "accumulate"
+    assert Stream.accumulate.__doc__ == it.accumulate.__doc__
+
+    # adapters are built once - calls don't introspect signatures
+    import inspect
+
+    monkeypatch.setattr(inspect, "signature", None)
+    assert Stream.of(1, 2, 3).accumulate(initial=10).to_list() == [10, 11, 13, 16]
+
+
 # ### itertools  'recipes' ###
 def test_tabulate():
     assert Stream.empty().tabulate(lambda x: x**2).limit(3).to_list() == [0, 1, 4]
@@ -313,6 +336,47 @@ def test_sliding_window_negative_count():
     assert str(e.value) == "Window size cannot be negative"
 
 
+def test_sliding_window_views():
+    expected = Stream("ABCDEFG").sliding_window(3).to_list()
+    assert Stream(iter("ABCDEFG")).sliding_window(3, copy=False).map(tuple).to_list() == expected
+    assert Stream.iterate(0, lambda x: x + 1).sliding_window(2, copy=False).map(sum).limit(
+        3
+    ).to_list() == [1, 3, 5]
+    assert Stream([1, 2]).sliding_window(3, copy=False).to_list() == []
+    assert Stream([1, 2]).sliding_window(0, copy=False).to_list() == []
+
+
+def test_sliding_window_view_shifts_in_place():
+    windows = []
+    for window in Stream(iter("ABCDE")).sliding_window(3, copy=False):
+        windows.append(window)
+        assert window == list(window)
+        assert window[0] == window[-3] and window[1] == list(window)[1]
+    # the same view is reused - it holds the last window
+    assert all(window is windows[0] for window in windows)
+    assert windows[0] == ("C", "D", "E")
+    with pytest.raises(IndexError):
+        windows[0][3]
+    with pytest.raises(TypeError):
+        windows[0][0] = "X"
+    with pytest.raises(TypeError):
+        windows[0].append("X")
+
+
+def test_sliding_window_memoryview():
+    import array
+
+    windows = Stream(b"abcd").sliding_window(2, copy=False).to_list()
+    assert all(isinstance(window, memoryview) and window.readonly for window in windows)
+    assert [window.tobytes() for window in windows] == [b"ab", b"bc", b"cd"]
+    data = array.array("d", [1.0, 2.0, 3.0])
+    assert Stream(data).sliding_window(2, copy=False).map(sum).to_list() == [3.0, 5.0]
+    assert Stream(bytearray(b"xyz")).sliding_window(2, copy=False).map(bytes).to_list() == [
+        b"xy",
+        b"yz",
+    ]
+
+
 def test_subslices():
     assert Stream("ABCD").subslices().to_list() == [
         "A",
@@ -328,6 +392,14 @@ def test_subslices():
     ]
 
 
+def test_subslices_after_skip_limit():
+    assert Stream([1, 2, 3]).skip(1).subslices().to_list() == [[2], [2, 3], [3]]
+    assert Stream((1, 2, 3, 4)).limit(2).subslices().to_list() == [(1,), (1, 2), (2,)]
+    assert Stream([1, 2, 3, 4]).skip(1).limit(2).subslices().map(type).distinct().to_list() == [
+        list
+    ]
+
+
 def test_subslices_empty_collection():
     assert Stream.empty().subslices().to_list() == []
 
@@ -339,6 +411,78 @@ def test_partition():
     ]
 
 
+def test_partition_single_pass():
+    calls = []
+    stream = Stream(range(10)).peek(calls.append).partition(lambda x: x > 6)
+    assert stream.to_list() == [[7, 8, 9], [0, 1, 2, 3, 4, 5, 6]]
+    assert calls == list(range(10))
+    assert Stream([]).partition(bool).to_list() == [[], []]
+
+
+def test_partition_collector_and_sinks():
+    from pyrio import collectors as C
+
+    assert Stream(range(10)).partition(lambda x: x % 3 == 0, C.summing()).to_list() == [18, 27]
+    small, large = [], []
+    assert Stream(range(10)).partition(
+        lambda x: x < 3, sinks=(small.append, large.append)
+    ).to_list() == [3, 7]
+    assert (small, large) == ([0, 1, 2], [3, 4, 5, 6, 7, 8, 9])
+
+
+def test_partition_by():
+    assert Stream(range(10)).partition_by(lambda x: x % 3, 3).to_list() == [
+        [0, 3, 6, 9],
+        [1, 4, 7],
+        [2, 5, 8],
+    ]
+    assert Stream("abcab").partition_by(lambda x: ord(x) - ord("a"), 4).map(len).to_list() == [
+        2,
+        2,
+        1,
+        0,
+    ]
+    buckets = [[] for _ in range(2)]
+    assert Stream(range(5)).partition_by(
+        lambda x: x % 2, 2, sinks=[bucket.append for bucket in buckets]
+    ).to_list() == [3, 2]
+    assert buckets == [[0, 2, 4], [1, 3]]
+
+
+def test_partition_by_size_hint_and_explain():
+    from pyrio.pipeline import EXACT
+
+    assert Stream(range(10)).partition_by(lambda x: x % 3, 3).size_hint() == (EXACT, 3)
+    assert Stream(iter(range(10))).partition(bool).len() == 2
+    sinks = [print, print]
+    explanation = Stream(range(4)).partition(bool, sinks=sinks).explain()
+    assert explanation.stages == (("partition", "streaming"),)
+
+
+def test_partition_by_raises():
+    with pytest.raises(ValueError) as e:
+        Stream(range(4)).partition_by(lambda x: 0, 0)
+    assert str(e.value) == "Buckets count must be positive"
+    with pytest.raises(ValueError) as e:
+        Stream(range(4)).partition_by(lambda x: 0, 2, sinks=[print])
+    assert str(e.value) == "Expected 2 sinks, got 1"
+    with pytest.raises(ValueError) as e:
+        Stream(range(4)).partition(bool, collector=list, sinks=[print, print])
+    assert str(e.value) == "Cannot use both a collector and sinks"
+    with pytest.raises(IndexError) as e:
+        Stream(range(4)).partition_by(lambda x: x - 1, 3).to_list()
+    assert str(e.value) == "Bucket index -1 out of range"
+
+
+def test_explain_itertools_stages():
+    explanation = Stream(range(10)).unique().partition(lambda x: x % 2).explain()
+    assert explanation.stages == (("unique", "materializing"), ("partition", "materializing"))
+    assert Stream("ABCD").sliding_window(2).pairwise().explain().stages == (
+        ("sliding_window", "buffering"),
+        ("pairwise", "streaming"),
+    )
+
+
 def test_round_robin():
     assert Stream(["ABC", "D", "EF"]).round_robin().to_list() == ["A", "D", "E", "B", "F", "C"]
 
@@ -0,0 +1,92 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from pyrio import Stream  # noqa: E402
+from pyrio.exceptions import IllegalStateError, NoneTypeError  # noqa: E402
+from pyrio.streams.numeric_stream import NumericStream  # noqa: E402
+
+
+def test_to_numeric():
+    numeric = Stream(range(10)).filter(lambda x: x % 2).to_numeric()
+    assert isinstance(numeric, NumericStream)
+    assert numeric.array.dtype == np.float64
+    assert numeric.to_list() == [1.0, 3.0, 5.0, 7.0, 9.0]
+    assert len(numeric) == 5
+
+
+def test_to_numeric_consumes_stream():
+    stream = Stream.of(1, 2, 3)
+    stream.to_numeric()
+    with pytest.raises(IllegalStateError):
+        stream.to_list()
+
+
+def test_to_numeric_chunks():
+    numeric = Stream(range(10)).to_numeric(dtype=np.int64, chunk_size=3)
+    assert numeric.array.dtype == np.int64
+    assert numeric.to_list() == list(range(10))
+
+    with pytest.raises(ValueError) as e:
+        Stream(range(10)).to_numeric(chunk_size=0)
+    assert str(e.value) == "Chunk size must be positive"
+
+
+def test_to_numeric_invalid_data():
+    for data in [(1, "a"), ("1.5",), (1, [2])]:
+        with pytest.raises(ValueError) as e:
+            Stream(data).to_numeric()
+        assert str(e.value) == "Cannot apply to_numeric on non-number elements"
+
+    with pytest.raises(NoneTypeError) as e:
+        NumericStream(None)
+    assert str(e.value) == "Cannot create NumericStream from None"
+
+
+def test_to_numeric_skips_none_keeps_nan():
+    assert Stream.of(1, None, 2).to_numeric(dtype=np.int64).to_list() == [1, 2]
+    numeric = Stream.of(1.0, None, float("nan"), 2.0).to_numeric(chunk_size=2)
+    assert len(numeric) == 3
+    assert np.isnan(numeric.array[1])
+    assert np.isnan(numeric.sum())
+    assert len(NumericStream(np.array([1.0, np.nan]))) == 2
+
+
+def test_numeric_aggregations():
+    numeric = Stream.of(1, None, 2, 3, 4).to_numeric()
+    assert numeric.sum() == Stream.of(1, None, 2, 3, 4).sum() == 10
+    assert numeric.average() == 2.5
+    assert numeric.min().get() == 1
+    assert numeric.max().get() == 4
+    assert numeric.std() == pytest.approx(1.118033988749895)
+    assert numeric.std(ddof=1) == pytest.approx(1.2909944487358056)
+    assert numeric.percentile(50) == 2.5
+    assert numeric.percentile([0, 100]) == [1.0, 4.0]
+
+
+def test_numeric_aggregations_empty():
+    numeric = Stream.empty().to_numeric()
+    assert numeric.sum() == 0
+    assert numeric.average() == 0
+    assert numeric.std() == 0
+    assert numeric.min().is_empty()
+    assert numeric.max(default=33).get() == 33
+    with pytest.raises(ValueError) as e:
+        numeric.percentile(50)
+    assert str(e.value) == "Cannot compute percentile of an empty stream"
+
+
+def test_numeric_arithmetic():
+    numeric = NumericStream([1, 2, 3])
+    assert (numeric * 2 + 1).to_list() == [3.0, 5.0, 7.0]
+    assert (10 - numeric).to_list() == [9.0, 8.0, 7.0]
+    assert (numeric / numeric).to_list() == [1.0, 1.0, 1.0]
+    assert (-(numeric**2)).to_list() == [-1.0, -4.0, -9.0]
+    assert abs(NumericStream([-1, 2])).to_list() == [1.0, 2.0]
+    assert numeric.to_list() == [1.0, 2.0, 3.0]
+
+
+def test_numeric_map_filter():
+    numeric = NumericStream(np.arange(6), dtype=np.int64)
+    assert numeric.map(np.square).filter(lambda a: a > 4).to_list() == [9, 16, 25]
+    assert numeric.to_stream().map(str).to_list() == ["0", "1", "2", "3", "4", "5"]
@@ -171,6 +171,27 @@ def test_peek():
     assert result == [60, 80]
 
 
+def test_fused_stages():
+    seen = []
+    stream = (
+        Stream([None, 1, 2, 3, 4, 5, 6])
+        .filter_map(lambda x: x * 10)
+        .peek(seen.append)
+        .filter(lambda x: x % 20 == 0)
+        .map(lambda x: x + 1)
+        .filter_map(str, discard_falsy=True)
+    )
+    assert len(stream._plan.stages) == 5
+    assert stream.to_list() == ["21", "41", "61"]
+    assert seen == [10, 20, 30, 40, 50, 60]
+
+
+def test_fused_stages_split_by_other_operations():
+    stream = Stream([1, 2, 3, 4, 5]).map(lambda x: x * 2).skip(1).map(lambda x: x + 1)
+    assert len(stream._plan.stages) == 3
+    assert stream.to_list() == [5, 7, 9, 11]
+
+
 # ### skip ###
 def test_skip():
     assert Stream([1, 2, 3, 4, 5, 6, 7, 8, 9, 10]).skip(7).to_tuple() == (8, 9, 10)
@@ -449,6 +470,47 @@ def test_average_all_none():
     assert Stream.of(None, None, None).average() == 0
 
 
+def test_sum_average_single_pass():
+    pulled = []
+    data = Stream(range(1, 5)).peek(pulled.append)
+    assert data.average() == 2.5
+    assert pulled == [1, 2, 3, 4]
+    assert Stream.iterate(1, lambda x: x + 1, lambda x: x <= 1000).sum() == 500500
+
+
+def test_summary_statistics():
+    stats = Stream.of(2, None, 4, 4, 4, 5, 5, 7, 9).summary_statistics()
+    assert (stats.count, stats.sum, stats.min, stats.max) == (8, 40, 2, 9)
+    assert stats.mean == 5.0
+    assert stats.variance == 4.0
+    assert stats.std == 2.0
+    assert stats.sample_variance == pytest.approx(32 / 7)
+
+
+def test_summary_statistics_empty():
+    stats = Stream.empty().summary_statistics()
+    assert (stats.count, stats.sum, stats.min, stats.max) == (0, 0, None, None)
+    assert stats.mean == 0
+    assert stats.variance == 0
+
+
+def test_summary_statistics_non_number_elements():
+    with pytest.raises(ValueError) as e:
+        Stream.of(1, "a").summary_statistics()
+    assert str(e.value) == "Cannot apply summary_statistics on non-number elements"
+
+
+def test_summary_statistics_combine():
+    from pyrio.utils import SummaryStatistics
+
+    left = Stream.of(2, 4, 4, 4).summary_statistics()
+    right = Stream.of(5, 5, 7, 9).summary_statistics()
+    combined = left.combine(right).combine(SummaryStatistics())
+    assert (combined.count, combined.sum, combined.min, combined.max) == (8, 40, 2, 9)
+    assert combined.mean == 5.0
+    assert combined.variance == pytest.approx(4.0)
+
+
 def test_take_while():
     assert Stream.of("adam", "aman", "ahmad", "hamid", "muhammad", "aladdin").take_while(
         lambda x: x[0] == "a"
@@ -558,6 +620,67 @@ def test_sort_comparator_and_reverse():
     ]
 
 
+def test_sort_limit_stable():
+    data = [(1, "a"), (0, "b"), (1, "c"), (0, "d"), (2, "e"), (1, "f")]
+    assert (
+        Stream(data).sort(itemgetter(0)).limit(4).to_list() == sorted(data, key=itemgetter(0))[:4]
+    )
+    assert (
+        Stream(data).sort(itemgetter(0), reverse=True).head(4).to_list()
+        == sorted(data, key=itemgetter(0), reverse=True)[:4]
+    )
+
+
+def test_sort_limit_bigger_than_stream_count():
+    assert Stream(x for x in (3, 1, 2)).sort().limit(10).to_list() == [1, 2, 3]
+
+
+def test_sort_with_memory_limit():
+    import random
+
+    data = [random.randint(0, 50) for _ in range(1_000)]
+    assert Stream(data).sort(memory_limit=64).to_list() == sorted(data)
+    assert Stream(data).sort(reverse=True, memory_limit=64).to_list() == sorted(data, reverse=True)
+    assert Stream(data).sort(memory_limit=5_000).to_list() == sorted(data)
+
+
+def test_sort_with_memory_limit_is_stable():
+    data = [(i % 7, i) for i in range(500)]
+    assert Stream(data).sort(itemgetter(0), memory_limit=30).to_list() == sorted(
+        data, key=itemgetter(0)
+    )
+    assert Stream(data).reverse(itemgetter(0), memory_limit=30).to_list() == sorted(
+        data, key=itemgetter(0), reverse=True
+    )
+    assert (
+        Stream(data).sort(itemgetter(0), memory_limit=30).limit(50).to_list()
+        == sorted(data, key=itemgetter(0))[:50]
+    )
+
+
+def test_sort_with_memory_limit_removes_spilled_runs(monkeypatch):
+    import tempfile
+
+    files = []
+    temporary_file = tempfile.TemporaryFile
+
+    def tracked_file(*args, **kwargs):
+        files.append(temporary_file(*args, **kwargs))
+        return files[-1]
+
+    monkeypatch.setattr(tempfile, "TemporaryFile", tracked_file)
+    result = Stream(list(range(100, 0, -1))).sort(memory_limit=10).limit(30).to_list()
+    assert result == list(range(1, 31))
+    assert len(files) == 10
+    assert all(file.closed for file in files)
+
+
+def test_sort_invalid_memory_limit():
+    with pytest.raises(ValueError) as e:
+        Stream.of(2, 1).sort(memory_limit=0)
+    assert str(e.value) == "Memory limit must be positive"
+
+
 # ### reverse ###
 def test_reverse():
     assert Stream.of(3, 5, 2, 1).map(lambda x: x * 10).reverse().to_list() == [
@@ -599,6 +722,42 @@ def test_reusing_stream():
     assert str(e.value) == "Stream object already consumed"
 
 
+def test_consumed_state_resolved_at_class_creation():
+    from pyrio.decorators import handle_consumed, pre_call
+
+    @pre_call(handle_consumed)
+    class Dummy:
+        def __init__(self):
+            self._is_consumed = False
+            self.closed = 0
+
+        @staticmethod
+        def helper(x):
+            return x * 2
+
+        def _private(self):
+            return "private"
+
+        def map(self):
+            return self
+
+        def to_list(self):
+            return []
+
+        def close(self):
+            self.closed += 1
+            self._is_consumed = True
+
+    dummy = Dummy()
+    assert Dummy.helper(2) == 4
+    assert dummy.map().to_list() == []
+    assert dummy.closed == 1
+    assert dummy._private() == "private"
+    dummy.close()
+    with pytest.raises(IllegalStateError):
+        dummy.map()
+
+
 def test_stream_close():
     stream = Stream.of(1, 2, 3)
     assert stream._is_consumed is False
@@ -692,6 +851,100 @@ def test_find_any_in_empty_stream():
     assert result.is_empty()
 
 
+def test_find_any_single_pass():
+    from collections import Counter
+
+    picks = Counter(Stream(iter(range(5))).find_any().get() for _ in range(2_000))
+    assert set(picks) == {0, 1, 2, 3, 4}
+    assert Stream.of(None).find_any().is_empty()
+
+
+# ### approximate distinct ###
+def test_distinct_approximate():
+    data = [i % 1_000 for i in range(5_000)]
+    result = Stream(data).distinct(approximate=True, error_rate=0.01, capacity=1_000).to_list()
+    assert len(result) == len(set(result))
+    # each distinct element is dropped with probability below the error rate
+    assert 970 <= len(result) <= 1_000
+    assert result == sorted(result)
+
+
+def test_distinct_approximate_no_builtin_hash_collisions():
+    # hash(-1) == hash(-2) in CPython
+    assert Stream([-2, -1]).distinct(approximate=True).to_list() == [-2, -1]
+    assert Stream([-1, -2, (-1,), (-2,)]).count_distinct(approximate=True) == 4
+    assert Stream([1, 1.0, True, "1", b"1"]).distinct(approximate=True).to_list() == [1, "1", b"1"]
+
+
+def test_distinct_approximate_invalid_arguments():
+    with pytest.raises(ValueError) as e:
+        Stream.of(1, 2).distinct(approximate=True, error_rate=0)
+    assert str(e.value) == "Error rate must be between 0 and 1"
+
+    with pytest.raises(ValueError) as e:
+        Stream.of(1, 2).distinct(approximate=True, capacity=0)
+    assert str(e.value) == "Capacity must be positive"
+
+
+def test_count_distinct():
+    assert Stream.of(1, 2, 2, 3, 1).count_distinct() == 3
+    assert Stream.empty().count_distinct(approximate=True) == 0
+    assert Stream.of("a", "b", "a").count_distinct(approximate=True) == 2
+
+
+def test_count_distinct_approximate_error():
+    data = (f"user-{i % 50_000}" for i in range(100_000))
+    estimate = Stream(data).count_distinct(approximate=True)
+    # 4 standard errors of 0.81%
+    assert abs(estimate - 50_000) < 50_000 * 0.0325
+
+    with pytest.raises(ValueError) as e:
+        Stream.of(1).count_distinct(approximate=True, precision=3)
+    assert str(e.value) == "Precision must be between 4 and 16"
+
+
+# ### sampling ###
+def test_sample():
+    result = Stream(range(1_000)).sample(10, seed=42).to_list()
+    assert len(result) == 10
+    assert len(set(result)) == 10
+    assert all(0 <= x < 1_000 for x in result)
+    assert Stream(iter(range(1_000))).sample(10, seed=42).to_list() == result
+
+
+def test_sample_small_stream():
+    assert sorted(Stream.of(3, 1, 2).sample(5).to_list()) == [1, 2, 3]
+    assert Stream.of(3, 1, 2).sample(0).to_list() == []
+
+
+def test_sample_is_uniform():
+    from collections import Counter
+
+    counts = Counter()
+    for seed in range(2_000):
+        counts.update(Stream(range(20)).sample(5, seed=seed).to_list())
+    # each element is expected 500 times
+    assert all(400 < counts[x] < 600 for x in range(20))
+
+
+def test_sample_fraction():
+    result = Stream(range(10_000)).sample_fraction(0.3, seed=7).to_list()
+    assert 2_700 < len(result) < 3_300
+    assert result == sorted(result)
+    assert Stream(range(10)).sample_fraction(0).to_list() == []
+    assert Stream(range(10)).sample_fraction(1).to_list() == list(range(10))
+
+
+def test_sample_invalid_arguments():
+    with pytest.raises(ValueError) as e:
+        Stream.of(1, 2).sample(-1)
+    assert str(e.value) == "Sample count cannot be negative"
+
+    with pytest.raises(ValueError) as e:
+        Stream.of(1, 2).sample_fraction(1.5)
+    assert str(e.value) == "Fraction must be between 0 and 1"
+
+
 # ### match ###
 def test_any_match():
     assert Stream.of(1, 2, 3, 4).any_match(lambda x: x > 2)
@@ -795,6 +1048,46 @@ def test_max_objects(Foo):
     assert Stream(coll).max(lambda x: x.num).get() is buzz
 
 
+# ### top k ###
+def test_min_k():
+    assert Stream.of(5, 3, 8, 1, 9, 2).min(k=3) == [1, 2, 3]
+    assert Stream.empty().min(k=3) == []
+
+
+def test_max_k(Foo):
+    fizz, buzz, jazz = Foo("fizz", 2), Foo("buzz", 1), Foo("jazz", 2)
+    assert Stream([fizz, buzz, jazz]).max(lambda x: x.num, k=2) == [fizz, jazz]
+
+
+def test_min_max_negative_k():
+    with pytest.raises(ValueError) as e:
+        Stream.of(1, 2).min(k=-1)
+    assert str(e.value) == "Min count cannot be negative"
+
+    with pytest.raises(ValueError) as e:
+        Stream.of(1, 2).max(k=-1)
+    assert str(e.value) == "Max count cannot be negative"
+
+
+def test_top_k():
+    scores = [("fizz", 30), ("buzz", 50), ("jazz", 10), ("mambo", 50), ("salsa", 40)]
+    assert Stream(scores).top_k(3, itemgetter(1)) == [("buzz", 50), ("mambo", 50), ("salsa", 40)]
+    assert Stream.of(1, 2, 3).top_k(0) == []
+
+
+def test_top_k_negative():
+    with pytest.raises(ValueError) as e:
+        Stream.of(1, 2).top_k(-1)
+    assert str(e.value) == "Top-k count cannot be negative"
+
+
+def test_top_k_consumes_stream():
+    stream = Stream.of(1, 2, 3)
+    stream.top_k(2)
+    with pytest.raises(IllegalStateError):
+        stream.to_list()
+
+
 # ### collectors ###
 def test_to_list():
     result = Stream((1, 2, 3)).to_list()
@@ -957,6 +1250,114 @@ def test_group_by_unconsumed_groups():
     assert keys == ["A", "B"]
 
 
+def test_group_by_memory_limit_keeps_consecutive_groups():
+    assert Stream("aabba").group_by() == {"a": ["a"], "b": ["b", "b"]}
+    assert Stream("aabba").group_by(memory_limit=1) == Stream("aabba").group_by()
+    data = [(i * 7919) % 500 for i in range(5_000)]
+    assert Stream(data).group_by(lambda x: x % 3 == 0, memory_limit=10) == Stream(data).group_by(
+        lambda x: x % 3 == 0
+    )
+    collector = lambda k, g: (k, [len(g)])  # noqa
+    assert Stream(data).group_by(lambda x: x % 3 == 0, collector, memory_limit=10) == Stream(
+        data
+    ).group_by(lambda x: x % 3 == 0, collector)
+
+
+def test_group_by_hashed():
+    assert Stream("aabba").group_by(hashed=True) == {"a": ["a", "a", "a"], "b": ["b", "b"]}
+    data = [(i * 7919) % 500 for i in range(5_000)]
+    expected = {}
+    for i in data:
+        expected.setdefault(i % 97, []).append(i)
+    assert Stream(data).group_by(lambda x: x % 97, hashed=True) == expected
+    assert Stream(data).group_by(lambda x: x % 97, memory_limit=10**6, hashed=True) == expected
+    spilled = Stream(data).group_by(lambda x: x % 97, memory_limit=50, hashed=True)
+    assert spilled == expected
+    assert list(spilled) == list(expected)
+
+
+def test_group_by_hashed_collector():
+    coll = [("fizz", 1), ("buzz", 2), ("fizz", 3), ("jazz", 4), ("buzz", 5)]
+    collector = lambda k, g: (k, [num for _, num in g])  # noqa
+    expected = {"fizz": [1, 3], "buzz": [2, 5], "jazz": [4]}
+    assert Stream(coll).group_by(itemgetter(0), collector, hashed=True) == expected
+    assert Stream(coll).group_by(itemgetter(0), collector, memory_limit=2, hashed=True) == expected
+    assert Stream(range(1_000)).group_by(
+        lambda x: x % 10, collector=lambda k, g: (k, len(g)), memory_limit=100, hashed=True
+    ) == {k: 100 for k in range(10)}
+
+
+def test_group_by_memory_limit_raises():
+    with pytest.raises(ValueError) as e:
+        Stream([1, 2]).group_by(memory_limit=0)
+    assert str(e.value) == "Memory limit must be positive"
+
+
+def test_group_by_spill_removes_temp_files(monkeypatch):
+    import tempfile
+
+    files = []
+    create = tempfile.TemporaryFile
+
+    def tracking(*args, **kwargs):
+        files.append(file := create(*args, **kwargs))
+        return file
+
+    monkeypatch.setattr(tempfile, "TemporaryFile", tracking)
+    assert (
+        len(Stream(range(1_000)).group_by(lambda x: x % 300, memory_limit=10, hashed=True)) == 300
+    )
+    assert files
+    assert all(file.closed for file in files)
+
+
+def test_to_dict_memory_limit():
+    data = [(f"k{i % 250}", i) for i in range(2_000)]
+    expected = Stream(data).to_dict(merger=lambda old, new: old + new)
+    spilled = Stream(data).to_dict(merger=lambda old, new: old + new, memory_limit=20)
+    assert spilled == expected
+    assert list(spilled) == list(expected)
+    assert Stream(range(100)).to_dict(lambda x: (x, x * x), memory_limit=5) == {
+        x: x * x for x in range(100)
+    }
+
+
+def test_to_dict_memory_limit_duplicate_key_raises():
+    with pytest.raises(IllegalStateError) as e:
+        Stream(range(100)).to_dict(lambda x: (x % 50, x), memory_limit=5)
+    assert str(e.value) == "Key '0' already exists"
+
+
+def test_aggregate_by_count():
+    assert Stream("AAAABBBCCD").aggregate_by() == Stream("AAAABBBCCD").group_by(
+        collector=lambda k, g: (k, len(g))
+    )
+    assert Stream("ABCABA").aggregate_by(count=True) == {"A": 3, "B": 2, "C": 1}
+    assert Stream.empty().aggregate_by() == {}
+
+
+def test_aggregate_by_multiple(Foo):
+    coll = [Foo("fizz", 1), Foo("buzz", 2), Foo("fizz", 3), Foo("buzz", None), Foo("buzz", 4)]
+    num = lambda obj: obj.num  # noqa
+    assert Stream(coll).aggregate_by(lambda obj: obj.name, sum=num) == {"fizz": 4, "buzz": 6}
+    assert Stream(coll).aggregate_by(
+        lambda obj: obj.name, count=True, sum=num, min=num, max=num, mean=num
+    ) == {
+        "fizz": {"count": 2, "sum": 4, "min": 1, "max": 3, "mean": 2.0},
+        "buzz": {"count": 3, "sum": 6, "min": 2, "max": 4, "mean": 3.0},
+    }
+
+
+def test_aggregate_by_identity_values():
+    assert Stream.of(5, 1, 8, 2, 7).aggregate_by(lambda x: x % 2, max=True, mean=True) == {
+        1: {"max": 7, "mean": 13 / 3},
+        0: {"max": 8, "mean": 5.0},
+    }
+    assert Stream.of(None, None).aggregate_by(lambda x: "k", min=True, mean=True) == {
+        "k": {"min": None, "mean": 0}
+    }
+
+
 def test_to_string(nested_json):
     assert Stream([1, (2, 3), {4, 5, 6}]).to_string() == "1, (2, 3), {4, 5, 6}"
     assert (
@@ -985,6 +1386,646 @@ def test_repr(nested_json):
     )
 
 
+# ### query plan ###
+def test_plan_merges_skip_and_limit():
+    stream = Stream(range(20)).skip(2).skip(3).limit(10).limit(8).skip(2)
+    assert stream.to_list() == [7, 8, 9, 10, 11, 12]
+    assert stream._plan.optimizations == [
+        "merge_skips",
+        "merge_limits",
+        "swap_limit_skip",
+        "merge_skips",
+        "index_source",
+        "index_source",
+    ]
+
+
+def test_plan_pushes_limit_before_map():
+    calls = []
+    stream = Stream.iterate(0, lambda x: x + 1).map(lambda x: calls.append(x) or x * 2).head(3)
+    assert stream.to_list() == [0, 2, 4]
+    assert calls == [0, 1, 2]
+    assert stream._plan.optimizations == ["push_limit_before_map"]
+
+
+def test_plan_collapses_sort_limit():
+    stream = Stream([5, 3, 8, 1, 9, 2]).sort().map(lambda x: x * 10).limit(3)
+    assert stream.to_list() == [10, 20, 30]
+    assert stream._plan.optimizations == ["push_limit_before_map", "collapse_sort_limit"]
+
+    stream = Stream([5, 3, 8, 1, 9, 2]).reverse().head(4).limit(2)
+    assert stream.to_list() == [9, 8]
+    assert stream._plan.optimizations == ["collapse_sort_limit", "collapse_sort_limit"]
+
+
+def test_plan_drops_sort_before_unordered_terminal():
+    stream = Stream([3, 1, 2, 1]).sort().map(lambda x: x * 2).sort(reverse=True)
+    assert stream.to_set() == {2, 4, 6}
+    assert stream._plan.optimizations == ["drop_unordered_sort", "drop_unordered_sort"]
+
+    stream = Stream([3, 1, 2]).sort().filter(lambda x: x > 1)
+    assert stream.sum() == 5
+    assert stream._plan.optimizations == ["drop_unordered_sort"]
+
+    stream = Stream([3, 1, 2]).sort().limit(2).filter(lambda x: x > 1)
+    assert stream.len() == 1
+    assert stream._plan.optimizations == ["collapse_sort_limit"]
+
+
+def test_plan_keeps_sort_before_ordered_terminal():
+    stream = Stream([3, 1, 2]).sort()
+    assert stream.to_list() == [1, 2, 3]
+    assert stream._plan.optimizations == []
+
+
+def test_explain():
+    stream = Stream([5, 3, 1, 4]).map(lambda x: x * 2).filter(bool).sort().limit(2).distinct()
+    explanation = stream.explain("to_list")
+    assert explanation.source == "list"
+    assert explanation.stages == (
+        ("fused(map, filter)", "streaming"),
+        ("sort(limit=2)", "buffering"),
+        ("distinct", "materializing"),
+    )
+    assert explanation.terminal == ("to_list", "materializing")
+    assert explanation.optimizations == ("collapse_sort_limit", "fuse_stages")
+    assert explanation.materializing == ("distinct", "to_list")
+    assert str(explanation) == (
+        "source: list\n"
+        "  fused(map, filter)             streaming\n"
+        "  sort(limit=2)                  buffering\n"
+        "  distinct                       materializing\n"
+        "terminal: to_list                materializing\n"
+        "optimizations: collapse_sort_limit, fuse_stages"
+    )
+    # explaining doesn't execute or consume the stream
+    assert stream.to_list() == [2, 6]
+
+
+def test_explain_unordered_terminal():
+    explanation = Stream(x for x in range(5)).tail(3).sort().explain("sum")
+    assert explanation.stages == (("tail(3)", "buffering"),)
+    assert explanation.optimizations == ("drop_unordered_sort",)
+
+
+def test_explain_find_any_matches_execution():
+    keys = []
+    stream = Stream([5, 3, 1]).sort(lambda x: keys.append(x) or x)
+    explanation = stream.explain("find_any")
+    assert explanation.stages == ()
+    assert explanation.optimizations == ("drop_unordered_sort",)
+    assert stream.find_any().get() in (5, 3, 1)
+    assert keys == []
+
+
+# ### size hints ###
+def test_size_hint():
+    from pyrio.pipeline import AT_MOST, EXACT, UNKNOWN, SizeHint
+
+    assert Stream([1, 2, 3]).map(str).enumerate().sort().size_hint() == SizeHint(EXACT, 3)
+    assert Stream({"x": 1, "y": 2}).peek(print).size_hint() == SizeHint(EXACT, 2)
+    assert Stream(range(10)).skip(3).limit(5).size_hint() == SizeHint(EXACT, 5)
+    assert Stream(range(10)).filter(bool).skip(8).size_hint() == SizeHint(AT_MOST, 2)
+    assert Stream(range(10)).concat([1, 2]).batch(4).size_hint() == SizeHint(EXACT, 3)
+    assert Stream(range(10)).view(-4, None, 2).size_hint() == SizeHint(EXACT, 2)
+    assert Stream(iter(range(10))).map(str).size_hint() == SizeHint(UNKNOWN)
+    assert Stream.generate(lambda: 1).limit(5).size_hint() == SizeHint(AT_MOST, 5)
+    assert Stream(range(10)).flat_map(range).size_hint() == SizeHint(UNKNOWN)
+
+
+def test_len_with_known_size_skips_stages():
+    mapped = []
+    stream = Stream(range(1000)).map(mapped.append).skip(10)
+    assert stream.len() == 990
+    assert mapped == []
+
+
+def test_len_runs_peek():
+    peeked = []
+    assert Stream([1, 2, 3]).peek(peeked.append).len() == 3
+    assert peeked == [1, 2, 3]
+    assert Stream(range(10)).map(str).peek(peeked.append).skip(8).len() == 2
+    assert peeked[3:] == [str(i) for i in range(10)]
+
+
+def test_len_with_unknown_size():
+    assert Stream(range(10)).filter(lambda x: x % 3 == 0).len() == 4
+    assert Stream.iterate(0, lambda x: x + 1).take_while(lambda x: x < 5).len() == 5
+
+
+def test_negative_index_on_generator():
+    assert Stream(range(10)).map(lambda x: x * 10).take_nth(-2).get() == 80
+    assert Stream(iter(range(10))).filter(lambda x: x % 2).take_nth(-1).get() == 9
+    assert Stream(iter(range(3))).take_nth(-5, default=33).get() == 33
+    assert Stream(range(3)).take_nth(-5, default=33).get() == 33
+
+
+def test_view_negative_indices_on_generator():
+    data = list(range(10))
+    for start, stop, step in [
+        (-4, None, None),
+        (-6, -2, None),
+        (-6, 8, 2),
+        (2, -3, None),
+        (1, -1, 3),
+    ]:
+        expected = data[start:stop:step]
+        assert Stream(iter(data)).view(start, stop, step).to_list() == expected
+        assert (
+            Stream(data).filter(bool).view(start, stop, step).to_list()
+            == [x for x in data if x][start:stop:step]
+        )
+        assert Stream(data).map(lambda x: x).view(start, stop, step).to_list() == expected
+
+
+def test_consume_and_sliding_window_on_generator():
+    assert Stream(iter(range(6))).consume(4).to_list() == [4, 5]
+    assert Stream(range(5)).map(str).sliding_window(3).to_list() == [
+        ("0", "1", "2"),
+        ("1", "2", "3"),
+        ("2", "3", "4"),
+    ]
+
+
+# ### indexed sources ###
+class _CountingList(list):
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.iterated = 0
+
+    def __iter__(self):
+        self.iterated += 1
+        return super().__iter__()
+
+
+def test_index_source_slices_lazily():
+    from pyrio.pipeline.sequence_view import SequenceView
+
+    data = _CountingList(range(1_000))
+    stream = Stream(data).skip(10).tail(5)
+    assert isinstance(stream.iterable, SequenceView)
+    assert stream.to_list() == [995, 996, 997, 998, 999]
+    assert data.iterated == 0
+    assert stream._plan.optimizations == ["index_source", "index_source"]
+
+
+def test_index_source_matches_iteration():
+    data = list(range(20))
+    for build in (
+        lambda s: s.skip(3).limit(10).tail(4),
+        lambda s: s.view(2, -3, 3).skip(1),
+        lambda s: s.tail(50).limit(0),
+        lambda s: s.limit(8).map(lambda x: x * 2).skip(2),
+        lambda s: s.consume(15).view(-3),
+    ):
+        assert build(Stream(data)).to_list() == build(Stream(iter(data))).to_list()
+        assert build(Stream(tuple(data))).to_list() == build(Stream(iter(data))).to_list()
+
+
+def test_from_range_keeps_range():
+    stream = Stream.from_range(0, 100, 3).tail(2)
+    assert isinstance(stream.iterable, range)
+    assert stream.to_list() == [96, 99]
+    assert Stream.from_range(10, 0, -2).sort().limit(2).iterable == range(2, 6, 2)
+    assert Stream.from_range(0, 10).reverse().head(3).to_list() == [9, 8, 7]
+    assert Stream.from_range(0, 10).sort(lambda x: -x).limit(2).to_list() == [9, 8]
+
+
+def test_take_last_and_nth_on_sequence():
+    data = _CountingList(range(100))
+    assert Stream(data).take_last().get() == 99
+    assert Stream(data).skip(10).take_nth(-3).get() == 97
+    assert Stream(data).take_nth(5).get() == 5
+    assert Stream(data).take_nth(200, default=-1).get() == -1
+    assert data.iterated == 0
+    assert Stream([]).take_last(default=33).get() == 33
+
+
+def test_explain_index_source():
+    explanation = Stream([1, 2, 3]).skip(1).map(str).explain("to_list")
+    assert explanation.source == "list"
+    assert explanation.stages == (("map", "streaming"),)
+    assert explanation.optimizations == ("index_source",)
+
+
+# ### parallel ###
+def _square(x):
+    return x * x
+
+
+def _is_even(x):
+    return x % 2 == 0
+
+
+def _pair(x):
+    return x, x
+
+
+def test_parallel():
+    assert Stream(range(100)).parallel(workers=2).map(_square).filter(_is_even).to_list() == [
+        x * x for x in range(100) if x % 2 == 0
+    ]
+
+
+def test_parallel_unordered():
+    result = (
+        Stream(range(100)).parallel(workers=2, ordered=False, chunk_size=7).map(_square).to_list()
+    )
+    assert sorted(result) == [x * x for x in range(100)]
+
+
+def test_parallel_with_sequential_stages():
+    stream = (
+        Stream([None, 3, 1, 2, None, 3])
+        .parallel(workers=2, chunk_size=2)
+        .filter_map(_square)
+        .flat_map(_pair)
+        .distinct()
+        .sort(reverse=True)
+        .map(str)
+    )
+    assert stream.explain().stages == (
+        ("parallel(filter_map, flat_map)", "buffering"),
+        ("distinct", "materializing"),
+        ("sort(reverse=True)", "materializing"),
+        ("parallel(map)", "buffering"),
+    )
+    assert stream.to_list() == ["9", "4", "1"]
+
+
+def test_parallel_infinite_stream():
+    assert Stream.iterate(0, lambda x: x + 1).parallel(workers=2).map(_square).filter(
+        _is_even
+    ).limit(4).to_list() == [0, 4, 16, 36]
+
+
+def test_parallel_invalid_options():
+    with pytest.raises(ValueError) as e:
+        Stream.of(1, 2).parallel(workers=0)
+    assert str(e.value) == "Workers count must be positive"
+
+    with pytest.raises(ValueError) as e:
+        Stream.of(1, 2).parallel(chunk_size=0)
+    assert str(e.value) == "Chunk size must be positive"
+
+
+# ### concurrent map ###
+def _tracking_mapper(max_active, calls):
+    import threading
+    import time
+
+    lock = threading.Lock()
+    active = [0]
+
+    def mapper(x):
+        with lock:
+            calls.append(x)
+            active[0] += 1
+            max_active[0] = max(max_active[0], active[0])
+        time.sleep(0.01)
+        with lock:
+            active[0] -= 1
+        return x * 10
+
+    return mapper
+
+
+def test_map_concurrent():
+    max_active, calls = [0], []
+    mapper = _tracking_mapper(max_active, calls)
+    assert Stream(range(20)).map_concurrent(mapper, max_workers=4).to_list() == [
+        x * 10 for x in range(20)
+    ]
+    assert 1 < max_active[0] <= 4
+
+
+def test_map_concurrent_unordered():
+    result = (
+        Stream(range(20)).map_concurrent(lambda x: x * 10, max_workers=4, ordered=False).to_list()
+    )
+    assert sorted(result) == [x * 10 for x in range(20)]
+
+
+def test_map_concurrent_infinite_stream():
+    max_active, calls = [0], []
+    mapper = _tracking_mapper(max_active, calls)
+    assert Stream.iterate(0, lambda x: x + 1).map_concurrent(
+        mapper, max_workers=2, max_in_flight=3
+    ).limit(5).to_list() == [0, 10, 20, 30, 40]
+    assert len(calls) <= 5 + 3
+
+
+def test_map_concurrent_invalid_options():
+    with pytest.raises(ValueError) as e:
+        Stream.of(1, 2).map_concurrent(str, max_workers=0)
+    assert str(e.value) == "Workers count must be positive"
+
+    with pytest.raises(ValueError) as e:
+        Stream.of(1, 2).map_concurrent(str, max_in_flight=0)
+    assert str(e.value) == "In-flight count must be positive"
+
+
+# ### fork ###
+def test_fork():
+    reads = []
+    source = Stream(range(1_000)).peek(reads.append)
+    assert source.fork(
+        lambda s: s.len(),
+        lambda s: s.map(lambda x: x % 7).distinct().len(),
+        lambda s: s.top_k(3),
+        lambda s: s.filter(lambda x: x % 2).sum(),
+        buffer_size=64,
+    ) == (1_000, 7, [999, 998, 997], 250_000)
+    assert reads == list(range(1_000))
+
+
+def test_fork_consumes_stream():
+    stream = Stream([1, 2, 3])
+    assert stream.fork(lambda s: s.to_list()) == ([1, 2, 3],)
+    with pytest.raises(IllegalStateError):
+        stream.to_list()
+
+
+def test_fork_early_finishing_pipeline():
+    assert Stream(range(1, 100_001)).fork(
+        lambda s: s.find_first().get(),
+        lambda s: s.limit(3).to_list(),
+        lambda s: s.len(),
+        buffer_size=8,
+    ) == (1, [1, 2, 3], 100_000)
+
+
+def test_fork_backpressure():
+    import time
+
+    produced, consumed = [0], [0]
+    lag = []
+
+    def source():
+        for i in range(1_000):
+            produced[0] += 1
+            lag.append(produced[0] - consumed[0])
+            yield i
+
+    def slow(stream):
+        def record(_):
+            consumed[0] += 1
+            if consumed[0] % 100 == 0:
+                time.sleep(0.01)
+
+        return stream.peek(record).len()
+
+    assert Stream(source()).fork(slow, lambda s: s.len(), buffer_size=16) == (1_000, 1_000)
+    # the reading stays within a few chunks of the slowest pipeline
+    assert max(lag) <= 4 * 16
+
+
+def test_fork_raises():
+    with pytest.raises(ZeroDivisionError):
+        Stream(range(10_000)).fork(
+            lambda s: s.len(), lambda s: s.map(lambda x: 1 / (x - 500)).sum()
+        )
+
+    def failing_source():
+        yield 1
+        raise KeyError("broken")
+
+    with pytest.raises(KeyError):
+        Stream(failing_source()).fork(lambda s: s.len())
+
+    with pytest.raises(IllegalStateError) as e:
+        Stream([1, 2]).fork(lambda s: s.map(str))
+    assert str(e.value) == "Forked pipeline must end with a terminal operation"
+
+    with pytest.raises(ValueError) as e:
+        Stream([1, 2]).fork()
+    assert str(e.value) == "At least one pipeline is required"
+    with pytest.raises(ValueError) as e:
+        Stream([1, 2]).fork(lambda s: s.len(), buffer_size=0)
+    assert str(e.value) == "Buffer size must be positive"
+
+
+# ### cache ###
+def test_cache_replays_without_reading_again():
+    reads = []
+    stream = Stream(iter(range(10))).peek(reads.append).filter(lambda x: x % 2).cache()
+    assert reads == []
+    assert stream.len() == 5
+    assert stream.map(lambda x: x * 10).to_list() == [10, 30, 50, 70, 90]
+    assert stream.map(lambda x: x % 3).distinct().len() == 3
+    # stages added after the cache are dropped by the terminal operation
+    assert stream.to_list() == [1, 3, 5, 7, 9]
+    assert stream.find_first().get() == 1
+    assert reads == list(range(10))
+    stream.close()
+    with pytest.raises(IllegalStateError):
+        stream.to_list()
+
+
+@pytest.mark.parametrize("storage, max_size", [("memory", None), ("memory", 2_048), ("disk", None)])
+def test_cache_storage(storage, max_size):
+    stream = Stream(str(i) for i in range(10_000)).cache(storage, max_size)
+    assert stream.len() == 10_000
+    assert stream.map(int).sum() == sum(range(10_000))
+    assert stream.skip(9_998).to_list() == ["9998", "9999"]
+    assert stream.sort(len, reverse=True).take_first().get() == "1000"
+
+
+def test_cache_memory_keeps_prefix_and_spills_rest():
+    from pyrio.utils.stream_cache import CACHE_CHUNK_SIZE
+
+    stream = Stream(range(10 * CACHE_CHUNK_SIZE)).cache(max_size=3 * CACHE_CHUNK_SIZE)
+    assert stream.to_list() == list(range(10 * CACHE_CHUNK_SIZE))
+    cache = stream._caches[-1]
+    memory, file, file_size = list(cache._chunks), cache._file, cache._file.seek(0, 2)
+    assert len(memory) == 3
+    assert len(cache._offsets) == 7
+    # replaying more than the budget reuses the in-memory prefix and reads the rest from the file
+    for _ in range(3):
+        assert stream.take_last(1).get() == 10 * CACHE_CHUNK_SIZE - 1
+        assert stream.limit(5).to_list() == [0, 1, 2, 3, 4]
+    assert all(a is b for a, b in zip(cache._chunks, memory, strict=True))
+    assert len(cache._offsets) == 7
+    assert file.seek(0, 2) == file_size
+    # interleaved replays seek to their own chunks
+    assert all(a == b for a, b in zip(cache, cache, strict=True))
+    stream.close()
+    assert file.closed
+
+
+@pytest.mark.parametrize("max_size", [1, 1_000, 2_000, 2_048, 2_999, 3_000, 5_000])
+def test_cache_memory_keeps_exactly_max_size(max_size):
+    stream = Stream(range(3_000)).cache(max_size=max_size)
+    assert stream.to_list() == list(range(3_000))
+    cache = stream._caches[-1]
+    assert sum(len(chunk) for chunk in cache._chunks) == min(max_size, 3_000)
+    assert stream.to_list() == list(range(3_000))
+    assert (cache._file is None) == (max_size >= 3_000)
+    stream.close()
+
+
+def test_cache_disk_keeps_nothing_in_memory():
+    stream = Stream(range(5_000)).cache("disk")
+    assert stream.len() == 5_000
+    cache = stream._caches[-1]
+    assert len(cache._chunks) == 0 and cache._file is not None
+    assert stream.to_list() == list(range(5_000))
+    stream.close()
+    assert cache._file is None
+
+
+def test_cache_rewinds_after_failed_operation():
+    def boom(x):
+        if x == 3:
+            raise RuntimeError("boom")
+        return x
+
+    stream = Stream(iter(range(5))).cache()
+    with pytest.raises(RuntimeError):
+        stream.map(boom).to_list()
+    assert stream.to_list() == [0, 1, 2, 3, 4]
+    assert stream.map(lambda x: x * 2).sum() == 20
+
+
+def test_len_does_not_consume_stream():
+    stream = Stream([1, 2, 3])
+    assert stream.len() == 3
+    assert stream.to_list() == [1, 2, 3]
+    cached = Stream(iter([1, 2, 3])).cache()
+    assert cached.map(str).len() == 3
+    assert cached.to_list() == [1, 2, 3]
+
+
+def test_cache_failed_fill_is_not_replayed():
+    def source():
+        yield from range(3)
+        raise RuntimeError("boom")
+
+    stream = Stream(source()).cache()
+    with pytest.raises(RuntimeError):
+        stream.to_list()
+    with pytest.raises(IllegalStateError) as e:
+        stream.to_list()
+    assert str(e.value) == "Stream cache could not be filled"
+
+
+def test_cache_raises():
+    with pytest.raises(ValueError) as e:
+        Stream([1]).cache("cloud")
+    assert str(e.value) == "Unsupported storage 'cloud'"
+    with pytest.raises(ValueError) as e:
+        Stream([1]).cache(max_size=-1)
+    assert str(e.value) == "Cache size cannot be negative"
+
+
+# ### batches ###
+def test_batch():
+    assert Stream(range(7)).batch(3).to_list() == [[0, 1, 2], [3, 4, 5], [6]]
+    assert Stream([]).batch(3).to_list() == []
+
+
+def test_map_batches():
+    calls = []
+
+    def bulk_mapper(batch):
+        calls.append(len(batch))
+        return [x * 10 for x in batch]
+
+    assert Stream(range(7)).filter(lambda x: x != 3).map_batches(bulk_mapper, size=4).map(
+        lambda x: x + 1
+    ).to_list() == [1, 11, 21, 41, 51, 61]
+    assert calls == [4, 2]
+
+
+def test_map_batches_lazy():
+    assert Stream.iterate(0, lambda x: x + 1).map_batches(lambda b: b, size=2).limit(
+        3
+    ).to_list() == [
+        0,
+        1,
+        2,
+    ]
+
+
+def test_batch_invalid_size():
+    with pytest.raises(ValueError) as e:
+        Stream.of(1, 2).batch(0)
+    assert str(e.value) == "Batch size must be positive"
+
+    with pytest.raises(ValueError) as e:
+        Stream.of(1, 2).map_batches(list, size=0)
+    assert str(e.value) == "Batch size must be positive"
+
+
+def _windows(data, size, step):
+    return [tuple(data[i : i + size]) for i in range(0, len(data) - size + 1, step)]
+
+
+@pytest.mark.parametrize("size, step", [(1, 1), (3, 1), (3, 2), (4, 4), (2, 5), (10, 1)])
+def test_window_aggregate(size, step):
+    data = [5, 1, 4, 4, 8, -2, 7, 0, 3, 3, 9]
+    windows = _windows(data, size, step)
+    for agg, expected in [
+        ("sum", [sum(w) for w in windows]),
+        ("mean", [sum(w) / size for w in windows]),
+        ("min", [min(w) for w in windows]),
+        ("max", [max(w) for w in windows]),
+        (sorted, [sorted(w) for w in windows]),
+    ]:
+        assert Stream(iter(data)).window_aggregate(size, step, agg).to_list() == expected
+
+
+def test_window_aggregate_float_cancellation():
+    import math
+
+    data = [1e16, 1.0, -1e16, 1.0, 1.0]
+    assert Stream(data).window_aggregate(2).to_list() == [
+        math.fsum(w) for w in _windows(data, 2, 1)
+    ]
+    assert Stream(data).window_aggregate(2).to_list()[-1] == 2.0
+    assert Stream(data).window_aggregate(2, agg="mean").to_list()[-1] == 1.0
+    data = [0.1 * (-1) ** i * i for i in range(10_000)]
+    assert Stream(data).window_aggregate(7, 3).to_list() == [
+        math.fsum(w) for w in _windows(data, 7, 3)
+    ]
+
+
+def test_window_aggregate_builtins_and_tumbling():
+    assert Stream(range(10)).window_aggregate(3, agg=max).to_list() == list(range(2, 10))
+    assert Stream(range(10)).window_aggregate(3, agg=min).to_list() == list(range(8))
+    # the incomplete last window is dropped
+    assert Stream(range(10)).window_aggregate(3, 3, agg=sum).to_list() == [3, 12, 21]
+    assert Stream([1, 2]).window_aggregate(3).to_list() == []
+
+
+def test_window_aggregate_unbounded():
+    assert Stream.iterate(0, lambda x: x + 1).window_aggregate(4, 2, "mean").limit(3).to_list() == [
+        1.5,
+        3.5,
+        5.5,
+    ]
+
+
+def test_window_aggregate_size_hint():
+    from pyrio.pipeline import EXACT
+
+    assert Stream(range(11)).window_aggregate(3, 2).size_hint() == (EXACT, 5)
+    assert Stream(range(2)).window_aggregate(3).size_hint() == (EXACT, 0)
+    assert Stream(range(11)).window_aggregate(3, 2).len() == 5
+
+
+def test_window_aggregate_raises():
+    with pytest.raises(ValueError) as e:
+        Stream.of(1, 2).window_aggregate(0)
+    assert str(e.value) == "Window size must be positive"
+    with pytest.raises(ValueError) as e:
+        Stream.of(1, 2).window_aggregate(2, 0)
+    assert str(e.value) == "Window step must be positive"
+    with pytest.raises(ValueError) as e:
+        Stream.of(1, 2).window_aggregate(2, agg="median")
+    assert str(e.value) == "Unsupported aggregation 'median'"
+
+
 # ### nested streams ###
 def test_nested_json_from_string(nested_json):
     assert (